@@ -0,0 +1,99 @@
+"""Caches used by the agent loop to skip redundant work."""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+def hash_text(text: str) -> str:
+    """Return a short content hash for a string."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def hash_json(data: Any) -> str:
+    """Return a stable content hash for a JSON-serializable value."""
+    return hash_text(json.dumps(data, sort_keys=True, ensure_ascii=False, default=str))
+
+
+class ResponseCache:
+    """
+    LRU cache of final LLM responses.
+
+    Entries are keyed by a hash of (model, tool definitions, messages), so a
+    hit means the provider would be asked exactly the same question again.
+    Callers leave the clock out of the key, so entries expire after ttl
+    seconds to bound how stale a time-dependent answer can get.
+    """
+
+    def __init__(self, max_size: int = 128, ttl: float = 60.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    @staticmethod
+    def make_key(model: str, tools_hash: str, messages: list[dict[str, Any]]) -> str:
+        """Build the cache key for a prompt."""
+        return hash_json([model, tools_hash, messages])
+
+    def get(self, key: str) -> str | None:
+        """Get a cached response, marking it as recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] >= self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key: str, content: str) -> None:
+        """Store a response, evicting the least recently used entry if full."""
+        if self.max_size <= 0:
+            return
+        self._entries[key] = (time.monotonic(), content)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ToolValueCache:
+    """
+    Results of read-only tool calls within one agent run.
+
+    Results of cacheable (read-only) tools are reused for identical calls
+    until a state-mutating call happens, which drops every cached result.
+    """
+
+    def __init__(self):
+        self._results: dict[tuple[str, str], str] = {}
+
+    def get(self, name: str, args_json: str) -> str | None:
+        """
+        Get the cached result of a call in the current state.
+
+        Args:
+            name: Tool name.
+            args_json: Canonical JSON encoding of the call arguments.
+        """
+        return self._results.get((name, args_json))
+
+    def record(self, name: str, args_json: str, result: str, cacheable: bool) -> None:
+        """
+        Record an executed tool call.
+
+        Cacheable results are stored; any other call is assumed to mutate
+        state and invalidates everything cached so far.
+        """
+        if not cacheable:
+            self._results.clear()
+        elif not result.startswith(("Error", '{"error"')):
+            self._results[(name, args_json)] = result
@@ -2,6 +2,7 @@
 
 import base64
 import mimetypes
+import re
 from pathlib import Path
 from typing import Any
 
@@ -18,6 +19,9 @@ class ContextBuilder:
     """
     
     BOOTSTRAP_FILES = ["AGENTS.md", "SOUL.md", "USER.md", "TOOLS.md", "IDENTITY.md"]
+
+    # The "## Current Time" section of the identity, heading plus timestamp line
+    _CURRENT_TIME_RE = re.compile(r"^## Current Time\n.*\n", re.MULTILINE)
     
     def __init__(self, workspace: Path):
         self.workspace = workspace
@@ -77,6 +81,11 @@ Skills with available="false" need dependencies installed first - you can try in
 
         return result
     
+    @classmethod
+    def strip_current_time(cls, system_prompt: str) -> str:
+        """Remove the Current Time section from a system prompt (for clock-independent keys)."""
+        return cls._CURRENT_TIME_RE.sub("", system_prompt, count=1)
+
     def _get_identity(self, mcp_info: str | None = None) -> str:
         """Get the core identity section."""
         from datetime import datetime
@@ -191,6 +200,8 @@ When remembering something, write to {workspace_path}/memory/MEMORY.md"""
         """
         Add a tool result to the message list.
         
+        The list is extended in place; it is also returned for convenience.
+        
         Args:
             messages: Current message list.
             tool_call_id: ID of the tool call.
@@ -198,7 +209,7 @@ When remembering something, write to {workspace_path}/memory/MEMORY.md"""
             result: Tool execution result.
         
         Returns:
-            Updated message list.
+            The same message list.
         """
         messages.append({
             "role": "tool",
@@ -217,13 +228,15 @@ When remembering something, write to {workspace_path}/memory/MEMORY.md"""
         """
         Add an assistant message to the message list.
         
+        The list is extended in place; it is also returned for convenience.
+        
         Args:
             messages: Current message list.
             content: Message content.
             tool_calls: Optional tool calls.
         
         Returns:
-            Updated message list.
+            The same message list.
         """
         msg: dict[str, Any] = {"role": "assistant", "content": content or ""}
         
@@ -1,15 +1,16 @@
 """Agent loop: the core processing engine."""
 
 import asyncio
-import json
+import re
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Callable
 
 from loguru import logger
 
 from nanobot.bus.events import InboundMessage, OutboundMessage
 from nanobot.bus.queue import MessageBus
-from nanobot.providers.base import LLMProvider
+from nanobot.providers.base import LLMProvider, ToolCallRequest
+from nanobot.agent.cache import ResponseCache, ToolValueCache, hash_text
 from nanobot.agent.context import ContextBuilder
 from nanobot.agent.tools.registry import ToolRegistry
 from nanobot.agent.tools.filesystem import ReadFileTool, WriteFileTool, EditFileTool, ListDirTool
@@ -19,9 +20,13 @@ from nanobot.agent.tools.message import MessageTool
 from nanobot.agent.tools.spawn import SpawnTool
 from nanobot.agent.subagent import SubagentManager
 from nanobot.session.manager import SessionManager
-from nanobot.mcp.client import MCPClientManager
+from nanobot.utils.helpers import json_dumps
+from nanobot.mcp.client import REQUIRED_FIELDS, MCPClientManager
 from nanobot.mcp.tools.adapter import MCPToolAdapter
 
+if TYPE_CHECKING:
+    from nanobot.config.schema import FastReplyConfig
+
 
 class AgentLoop:
     """
@@ -46,6 +51,9 @@ class AgentLoop:
         exec_config: "ExecToolConfig | None" = None,
         mcp_config: "MCPConfig | None" = None,
         silent: bool = False,
+        response_cache_size: int = 128,
+        max_history: int = 50,
+        fast_replies: "list[FastReplyConfig] | None" = None,
     ):
         from nanobot.config.schema import ExecToolConfig, MCPConfig
         self.bus = bus
@@ -59,7 +67,7 @@ class AgentLoop:
         self.silent = silent
 
         self.context = ContextBuilder(workspace)
-        self.sessions = SessionManager(workspace)
+        self.sessions = SessionManager(workspace, max_history=max_history)
         self.tools = ToolRegistry()
         self.subagents = SubagentManager(
             provider=provider,
@@ -71,9 +79,40 @@ class AgentLoop:
         )
 
         self._running = False
+        self._task: asyncio.Task | None = None
+        self._idle = False
         self._mcp_manager = None
+        self._mcp_info_cache: tuple[int, str | None] | None = None
+        self._response_cache = ResponseCache(max_size=response_cache_size)
+        self._tools_hash: tuple[int, str] | None = None
+        self._fastpath: dict[re.Pattern[str], Callable[[InboundMessage], str]] = {}
+        for rule in fast_replies or []:
+            self.add_fast_reply(rule.pattern, lambda msg, reply=rule.reply: reply)
         self._register_default_tools()
     
+    def add_fast_reply(self, pattern: str, handler: Callable[[InboundMessage], str]) -> None:
+        """
+        Answer messages fully matching a regex without calling the LLM.
+        
+        Args:
+            pattern: Regex matched against the whole stripped message content.
+            handler: Builds the reply from the inbound message.
+        """
+        try:
+            self._fastpath[re.compile(pattern)] = handler
+        except re.error as e:
+            logger.warning(f"Invalid fast reply pattern {pattern!r}, skipping: {e}")
+    
+    def _match_fast_reply(self, msg: InboundMessage) -> str | None:
+        """Get the fast-path reply for a message, if any pattern matches."""
+        if not self._fastpath:
+            return None
+        content = msg.content.strip()
+        for pattern, handler in self._fastpath.items():
+            if pattern.fullmatch(content):
+                return handler(msg)
+        return None
+    
     def _register_default_tools(self) -> None:
         """Register the default set of tools."""
         # File tools
@@ -104,20 +143,32 @@ class AgentLoop:
         # Initialize MCP manager (will start in run())
         self._init_mcp_clients()
 
+    def _get_tools_hash(self) -> str:
+        """Hash of the tool definitions, recomputed whenever the registry changes."""
+        version = self.tools.version
+        if self._tools_hash is None or self._tools_hash[0] != version:
+            self._tools_hash = (version, hash_text(self.tools.get_definitions_json()))
+        return self._tools_hash[1]
+
+    def _response_cache_key(self, messages: list[dict[str, Any]]) -> str:
+        """
+        Build the response cache key for a prompt.
+
+        The system prompt's Current Time line changes every minute, so it is
+        left out of the key; ResponseCache's ttl bounds how old a replayed
+        answer can be instead.
+        """
+        system, *rest = messages
+        system = {**system, "content": ContextBuilder.strip_current_time(system["content"])}
+        return ResponseCache.make_key(self.model, self._get_tools_hash(), [system, *rest])
+
     def _init_mcp_clients(self) -> None:
         """Initialize MCP client manager if configured."""
         clients_config = {}
         if self.mcp_config and self.mcp_config.clients:
-            for name, client in self.mcp_config.clients.model_dump(exclude_unset=True).items():
-                if not client.get("enabled", False):
-                    continue
-
-                client_type = client.get("type", "stdio")
-
+            for name, client in self.mcp_config.enabled_clients.items():
                 # 根据类型验证配置
-                if client_type == "stdio" and client.get("command"):
-                    clients_config[name] = client
-                elif client_type in ("http", "streamable_http") and client.get("url"):
+                if getattr(client, REQUIRED_FIELDS[client.type]):
                     clients_config[name] = client
                 else:
                     logger.warning(f"MCP client '{name}' has incomplete config, skipping")
@@ -160,9 +211,16 @@ class AgentLoop:
     def _get_mcp_info(self) -> str | None:
         """Get information about connected MCP servers for system prompt."""
         if not self._mcp_manager:
-            logger.debug("No MCP manager configured")
             return None
 
+        # Only rebuilt when the set of connected clients changes
+        version = self._mcp_manager.version
+        if self._mcp_info_cache is None or self._mcp_info_cache[0] != version:
+            self._mcp_info_cache = (version, self._build_mcp_info())
+        return self._mcp_info_cache[1]
+
+    def _build_mcp_info(self) -> str | None:
+        """Build the MCP servers section of the system prompt."""
         clients = self._mcp_manager.get_all_clients()
         logger.debug(f"Connected MCP clients: {list(clients.keys())}")
 
@@ -177,12 +235,13 @@ class AgentLoop:
             info = f"- **{name}** (type: {client_type})"
 
             # Add additional info based on type
-            if client_type == "stdio":
-                command = client.config.get("command", "")
-                info += f" - 命令: `{command}`"
-            elif client_type in ["http", "streamable_http"]:
-                url = client.config.get("url", "")
-                info += f" - URL: `{url}`"
+            match client_type:
+                case "stdio":
+                    command = client.config.command or ""
+                    info += f" - 命令: `{command}`"
+                case "http" | "streamable_http":
+                    url = client.config.url
+                    info += f" - URL: `{url}`"
 
             server_info.append(info)
 
@@ -205,31 +264,36 @@ class AgentLoop:
             await self._mcp_manager.start()
             await self._register_mcp_tools()
 
+        self._task = asyncio.current_task()
         while self._running:
+            # Wait for next message; stop() cancels this wait while idle
+            self._idle = True
             try:
-                # Wait for next message
-                msg = await asyncio.wait_for(
-                    self.bus.consume_inbound(),
-                    timeout=1.0
-                )
+                msg = await self.bus.consume_inbound()
+            except asyncio.CancelledError:
+                if self._running:
+                    raise
+                self._task.uncancel()
+                break
+            finally:
+                self._idle = False
 
-                # Process it
-                try:
-                    response = await self._process_message(msg)
-                    if response:
-                        await self.bus.publish_outbound(response)
-                except Exception as e:
-                    logger.error(f"Error processing message: {e}")
-                    # Send error response
-                    await self.bus.publish_outbound(OutboundMessage(
-                        channel=msg.channel,
-                        chat_id=msg.chat_id,
-                        content=f"Sorry, I encountered an error: {str(e)}"
-                    ))
-            except asyncio.TimeoutError:
-                continue
-
-        # Clean up MCP clients after loop exits (same task)
+            # Process it
+            try:
+                response = await self._process_message(msg)
+                if response:
+                    await self.bus.publish_outbound(response)
+            except Exception as e:
+                logger.error(f"Error processing message: {e}")
+                # Send error response
+                await self.bus.publish_outbound(OutboundMessage(
+                    channel=msg.channel,
+                    chat_id=msg.chat_id,
+                    content=f"Sorry, I encountered an error: {str(e)}"
+                ))
+        self._task = None
+
+        # Clean up MCP clients after loop exits (each is closed by its own connection task)
         if self._mcp_manager:
             try:
                 await self._mcp_manager.stop()
@@ -240,12 +304,19 @@ class AgentLoop:
     def stop(self) -> None:
         """Stop the agent loop.
 
-        Note: This is a synchronous stop that only sets the flag.
-        For proper cleanup, use stop_async() instead.
+        Note: This is a synchronous stop. If run() is waiting for a message
+        it is woken up immediately; a message being processed is finished
+        first. For proper cleanup, use stop_async() instead.
         """
         self._running = False
+        self._wake()
         logger.info("Agent loop stopping")
 
+    def _wake(self) -> None:
+        """Interrupt run() if it is idle waiting on the bus."""
+        if self._task is not None and self._idle:
+            self._task.cancel()
+
     async def stop_async(self) -> None:
         """Async version of stop for proper cleanup.
 
@@ -254,6 +325,7 @@ class AgentLoop:
         primarily for cleanup when using process_direct().
         """
         self._running = False
+        self._wake()
         logger.info("Agent loop stopping")
     
     async def _process_message(self, msg: InboundMessage) -> OutboundMessage | None:
@@ -273,6 +345,16 @@ class AgentLoop:
         
         logger.info(f"Processing message from {msg.channel}:{msg.sender_id}")
         
+        # Trivial messages with a configured canned reply skip the LLM entirely
+        fast_reply = self._match_fast_reply(msg)
+        if fast_reply is not None:
+            logger.debug(f"Fast reply for {msg.session_key}")
+            return OutboundMessage(
+                channel=msg.channel,
+                chat_id=msg.chat_id,
+                content=fast_reply
+            )
+        
         # Get or create session
         session = self.sessions.get_or_create(msg.session_key)
         
@@ -295,22 +377,33 @@ class AgentLoop:
             mcp_info=mcp_info,
         )
         
+        # Identical prompts get the cached final response without an LLM call
+        cache_key = self._response_cache_key(messages)
+        final_content = self._response_cache.get(cache_key)
+        if final_content is not None:
+            logger.debug(f"Response cache hit for {msg.session_key}")
+        
         # Agent loop
         iteration = 0
-        final_content = None
+        tool_cache = ToolValueCache()
+        tool_defs = self.tools.get_definitions()
         
-        while iteration < self.max_iterations:
+        while final_content is None and iteration < self.max_iterations:
             iteration += 1
             
             # Call LLM
             response = await self.provider.chat(
                 messages=messages,
-                tools=self.tools.get_definitions(),
+                tools=tool_defs,
                 model=self.model
             )
             
             # Handle tool calls
             if response.has_tool_calls:
+                # Serialize each call's arguments once; sorted keys keep the
+                # prompt prefix byte-stable across iterations
+                args_json = [json_dumps(tc.arguments, sort_keys=True) for tc in response.tool_calls]
+                
                 # Add assistant message with tool calls
                 tool_call_dicts = [
                     {
@@ -318,26 +411,24 @@ class AgentLoop:
                         "type": "function",
                         "function": {
                             "name": tc.name,
-                            "arguments": json.dumps(tc.arguments)  # Must be JSON string
+                            "arguments": arguments  # Must be JSON string
                         }
                     }
-                    for tc in response.tool_calls
+                    for tc, arguments in zip(response.tool_calls, args_json)
                 ]
-                messages = self.context.add_assistant_message(
-                    messages, response.content, tool_call_dicts
-                )
+                self.context.add_assistant_message(messages, response.content, tool_call_dicts)
                 
                 # Execute tools
-                for tool_call in response.tool_calls:
-                    args_str = json.dumps(tool_call.arguments)
-                    logger.debug(f"Executing tool: {tool_call.name} with arguments: {args_str}")
-                    result = await self.tools.execute(tool_call.name, tool_call.arguments)
-                    messages = self.context.add_tool_result(
-                        messages, tool_call.id, tool_call.name, result
-                    )
+                results = await self._execute_tool_calls(response.tool_calls, args_json, tool_cache)
+                for tool_call, result in zip(response.tool_calls, results):
+                    self.context.add_tool_result(messages, tool_call.id, tool_call.name, result)
             else:
                 # No tool calls, we're done
                 final_content = response.content
+                # Only answers that ran no tools are safe to replay; provider
+                # errors come back as content too and must not be cached
+                if iteration == 1 and final_content and response.finish_reason != "error":
+                    self._response_cache.put(cache_key, final_content)
                 break
         
         if final_content is None:
@@ -394,6 +485,8 @@ class AgentLoop:
         
         # Agent loop (limited for announce handling)
         iteration = 0
+        tool_cache = ToolValueCache()
+        tool_defs = self.tools.get_definitions()
         final_content = None
         
         while iteration < self.max_iterations:
@@ -401,33 +494,28 @@ class AgentLoop:
             
             response = await self.provider.chat(
                 messages=messages,
-                tools=self.tools.get_definitions(),
+                tools=tool_defs,
                 model=self.model
             )
             
             if response.has_tool_calls:
+                args_json = [json_dumps(tc.arguments, sort_keys=True) for tc in response.tool_calls]
                 tool_call_dicts = [
                     {
                         "id": tc.id,
                         "type": "function",
                         "function": {
                             "name": tc.name,
-                            "arguments": json.dumps(tc.arguments)
+                            "arguments": arguments
                         }
                     }
-                    for tc in response.tool_calls
+                    for tc, arguments in zip(response.tool_calls, args_json)
                 ]
-                messages = self.context.add_assistant_message(
-                    messages, response.content, tool_call_dicts
-                )
+                self.context.add_assistant_message(messages, response.content, tool_call_dicts)
                 
-                for tool_call in response.tool_calls:
-                    args_str = json.dumps(tool_call.arguments)
-                    logger.debug(f"Executing tool: {tool_call.name} with arguments: {args_str}")
-                    result = await self.tools.execute(tool_call.name, tool_call.arguments)
-                    messages = self.context.add_tool_result(
-                        messages, tool_call.id, tool_call.name, result
-                    )
+                results = await self._execute_tool_calls(response.tool_calls, args_json, tool_cache)
+                for tool_call, result in zip(response.tool_calls, results):
+                    self.context.add_tool_result(messages, tool_call.id, tool_call.name, result)
             else:
                 final_content = response.content
                 break
@@ -446,6 +534,67 @@ class AgentLoop:
             content=final_content
         )
     
+    async def _execute_tool_calls(
+        self,
+        tool_calls: list[ToolCallRequest],
+        args_json: list[str],
+        tool_cache: ToolValueCache,
+    ) -> list[str]:
+        """
+        Execute the tool calls of one LLM turn.
+        
+        Calls run concurrently when every tool in the batch is parallel-safe,
+        otherwise sequentially. Results are returned in the original order.
+        """
+        if len(tool_calls) > 1 and all(
+            (tool := self.tools.get(tc.name)) is not None and tool.parallel_safe
+            for tc in tool_calls
+        ):
+            results = await asyncio.gather(
+                *(self._execute_tool(tc, a, tool_cache) for tc, a in zip(tool_calls, args_json)),
+                return_exceptions=True,
+            )
+            return [
+                f"Error executing {tc.name}: {str(r)}" if isinstance(r, Exception) else r
+                for tc, r in zip(tool_calls, results)
+            ]
+        
+        return [
+            await self._execute_tool(tc, a, tool_cache)
+            for tc, a in zip(tool_calls, args_json)
+        ]
+    
+    async def _execute_tool(
+        self,
+        tool_call: ToolCallRequest,
+        args_json: str,
+        tool_cache: ToolValueCache,
+    ) -> str:
+        """
+        Execute a tool call, reusing a cached result for read-only tools.
+        
+        Args:
+            tool_call: The tool call requested by the LLM.
+            args_json: Canonical JSON encoding of the call arguments.
+            tool_cache: Read-only tool results for the current run.
+        
+        Returns:
+            Tool execution result as string.
+        """
+        tool = self.tools.get(tool_call.name)
+        cacheable = tool is not None and tool.cacheable
+        if cacheable:
+            cached = tool_cache.get(tool_call.name, args_json)
+            if cached is not None:
+                logger.debug(f"Tool cache hit: {tool_call.name}")
+                return cached
+        
+        # Formatted by loguru only when a DEBUG sink is enabled
+        logger.debug("Executing tool: {} with arguments: {}", tool_call.name, args_json)
+        result = await self.tools.execute(tool_call.name, tool_call.arguments)
+        tool_cache.record(tool_call.name, args_json, result, cacheable)
+        return result
+    
     async def process_direct(self, content: str, session_key: str = "cli:direct") -> str:
         """
         Process a message directly (for CLI usage).
@@ -474,7 +623,7 @@ class AgentLoop:
             response = await self._process_message(msg)
             return response.content if response else ""
         finally:
-            # Immediately clean up MCP clients in the same task
+            # Immediately clean up MCP clients (each is closed by its own connection task)
             if self._mcp_manager and getattr(self, '_mcp_started', False):
                 try:
                     await asyncio.wait_for(self._mcp_manager.stop(), timeout=2.0)
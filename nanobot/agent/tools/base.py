@@ -12,6 +12,14 @@ class Tool(ABC):
     the environment, such as reading files, executing commands, etc.
     """
     
+    # No per-instance state here, so subclasses may use __slots__
+    __slots__ = ()
+    
+    # Read-only tools whose results may be reused until state changes
+    cacheable: bool = False
+    # Tools that may run concurrently with other calls in the same turn
+    parallel_safe: bool = False
+    
     _TYPE_MAP = {
         "string": str,
         "integer": int,
@@ -9,6 +9,9 @@ from nanobot.agent.tools.base import Tool
 class ReadFileTool(Tool):
     """Tool to read file contents."""
     
+    cacheable = True
+    parallel_safe = True
+    
     @property
     def name(self) -> str:
         return "read_file"
@@ -147,6 +150,9 @@ class EditFileTool(Tool):
 class ListDirTool(Tool):
     """Tool to list directory contents."""
     
+    cacheable = True
+    parallel_safe = True
+    
     @property
     def name(self) -> str:
         return "list_dir"
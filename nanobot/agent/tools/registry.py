@@ -1,5 +1,6 @@
 """Tool registry for dynamic tool management."""
 
+import json
 from typing import Any
 
 from nanobot.agent.tools.base import Tool
@@ -14,14 +15,29 @@ class ToolRegistry:
     
     def __init__(self):
         self._tools: dict[str, Tool] = {}
+        self._version = 0
+        self._definitions_cache: list[dict[str, Any]] | None = None
+        self._definitions_json: tuple[int, str] | None = None
     
     def register(self, tool: Tool) -> None:
         """Register a tool."""
         self._tools[tool.name] = tool
+        self._changed()
     
     def unregister(self, name: str) -> None:
         """Unregister a tool by name."""
-        self._tools.pop(name, None)
+        if self._tools.pop(name, None) is not None:
+            self._changed()
+    
+    def _changed(self) -> None:
+        """Invalidate cached definitions after a mutation."""
+        self._version += 1
+        self._definitions_cache = None
+    
+    @property
+    def version(self) -> int:
+        """Counter bumped on every registry mutation."""
+        return self._version
     
     def get(self, name: str) -> Tool | None:
         """Get a tool by name."""
@@ -32,8 +48,22 @@ class ToolRegistry:
         return name in self._tools
     
     def get_definitions(self) -> list[dict[str, Any]]:
-        """Get all tool definitions in OpenAI format."""
-        return [tool.to_schema() for tool in self._tools.values()]
+        """
+        Get all tool definitions in OpenAI format.
+        
+        The list is built once and reused until the registry changes,
+        so callers must not mutate it.
+        """
+        if self._definitions_cache is None:
+            self._definitions_cache = [tool.to_schema() for tool in self._tools.values()]
+        return self._definitions_cache
+    
+    def get_definitions_json(self) -> str:
+        """Get tool definitions as canonical JSON, cached until the registry changes."""
+        if self._definitions_json is None or self._definitions_json[0] != self._version:
+            payload = json.dumps(self.get_definitions(), sort_keys=True, ensure_ascii=False)
+            self._definitions_json = (self._version, payload)
+        return self._definitions_json[1]
     
     async def execute(self, name: str, params: dict[str, Any]) -> str:
         """
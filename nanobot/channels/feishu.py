@@ -1,9 +1,7 @@
 """飞书 channel 实现."""
 
 import asyncio
-import hashlib
 import hmac
-import json
 import time
 from typing import Any
 
@@ -14,6 +12,7 @@ from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
 from nanobot.config.schema import FeishuConfig
+from nanobot.utils.helpers import json_dumps, json_loads
 
 
 class FeishuChannel(BaseChannel):
@@ -30,9 +29,13 @@ class FeishuChannel(BaseChannel):
         super().__init__(config, bus)
         self.config: FeishuConfig = config
         self._access_token: str | None = None
-        self._token_expires_at: int = 0
+        self._token_expires_at: float = 0.0  # time.monotonic() 时间
         self._webhook_server: Any = None
         self._http_client: httpx.AsyncClient | None = None
+        self._auth_headers: dict[str, str] = {}
+        self._stop_event = asyncio.Event()
+        self._event_queue: asyncio.Queue[dict] = asyncio.Queue()
+        self._drain_task: asyncio.Task | None = None
 
     async def start(self) -> None:
         """启动飞书 channel."""
@@ -41,15 +44,27 @@ class FeishuChannel(BaseChannel):
             return
 
         self._running = True
-        self._http_client = httpx.AsyncClient(timeout=30.0)
+        self._stop_event.clear()
+        # 复用连接：HTTP/2 + keep-alive 连接池，避免每次发送都重新握手
+        self._http_client = httpx.AsyncClient(
+            http2=True,
+            timeout=30.0,
+            limits=httpx.Limits(
+                max_keepalive_connections=20,
+                max_connections=50,
+                keepalive_expiry=120,
+            ),
+        )
 
         # 获取初始 access token
         await self._refresh_access_token()
 
-        # 启动 webhook 服务器和 token 刷新任务
+        # 启动 webhook 服务器、token 刷新任务和入站事件批处理任务
+        self._drain_task = asyncio.create_task(self._drain_event_queue())
         tasks = [
             asyncio.create_task(self._start_webhook_server()),
             asyncio.create_task(self._refresh_token_loop()),
+            self._drain_task,
         ]
 
         # 等待所有任务完成（它们应该一直运行）
@@ -58,6 +73,11 @@ class FeishuChannel(BaseChannel):
     async def stop(self) -> None:
         """停止飞书 channel."""
         self._running = False
+        self._stop_event.set()
+
+        if self._drain_task:
+            self._drain_task.cancel()
+            self._drain_task = None
 
         if self._http_client:
             await self._http_client.aclose()
@@ -109,28 +129,29 @@ class FeishuChannel(BaseChannel):
             f"{self.config.webhook_path}"
         )
 
-        # 保持运行
-        while self._running:
-            await asyncio.sleep(1)
+        # 保持运行，直到 stop() 被调用
+        await self._stop_event.wait()
 
     async def _handle_webhook_request(self, request: Any) -> Any:
         """处理飞书 webhook 请求."""
         from aiohttp import web
 
         try:
+            # 只读取一次原始请求体，签名验证和 JSON 解析共用
+            raw = await request.read()
+
             # 验证签名
             if self.config.verify_token:
                 timestamp = request.headers.get("X-Lark-Request-Timestamp", "")
                 nonce = request.headers.get("X-Lark-Request-Nonce", "")
                 signature = request.headers.get("X-Lark-Signature", "")
-                body = await request.read()
 
-                if not self._verify_signature(timestamp, nonce, body, signature):
+                if not self._verify_signature(timestamp, nonce, raw, signature):
                     logger.warning("飞书 webhook 签名验证失败")
                     return web.Response(status=401)
 
             # 解析请求体
-            body = await request.json()
+            body = json_loads(raw)
 
             # 处理 URL 验证挑战
             if body.get("type") == "url_verification":
@@ -148,6 +169,25 @@ class FeishuChannel(BaseChannel):
             return web.Response(status=500)
 
     async def _handle_message_event(self, event: dict) -> None:
+        """将飞书消息事件放入队列，由后台任务批量处理."""
+        self._event_queue.put_nowait(event)
+
+    async def _drain_event_queue(self) -> None:
+        """
+        批量处理入站消息事件.
+
+        等待第一个事件，然后取走队列中已有的事件（最多 batch_max_size 个），
+        按到达顺序依次转发。不额外等待，单条消息不会增加延迟。
+        """
+        while self._running:
+            batch = [await self._event_queue.get()]
+            while len(batch) < self.config.batch_max_size and not self._event_queue.empty():
+                batch.append(self._event_queue.get_nowait())
+
+            for event in batch:
+                await self._process_message_event(event)
+
+    async def _process_message_event(self, event: dict) -> None:
         """处理飞书消息事件."""
         try:
             event_data = event.get("event", {})
@@ -160,7 +200,7 @@ class FeishuChannel(BaseChannel):
 
             # 解析消息内容
             content_str = message.get("content", "")
-            content_json = json.loads(content_str) if content_str else {}
+            content_json = json_loads(content_str) if content_str else {}
 
             # 获取文本内容
             text_content = content_json.get("text", "")
@@ -191,13 +231,9 @@ class FeishuChannel(BaseChannel):
         """定期刷新 access token."""
         while self._running:
             try:
-                # 计算刷新间隔（提前 5 分钟刷新）
-                refresh_interval = max(60, (self._token_expires_at - int(time.time()) - 300))
-                if refresh_interval > 0:
-                    await asyncio.sleep(refresh_interval)
-                else:
-                    # token 已过期，立即刷新
-                    await asyncio.sleep(10)
+                # 在过期前 5 分钟刷新；已到期则几乎立即刷新（至少等待 1 秒避免空转）
+                refresh_at = self._token_expires_at - 300
+                await asyncio.sleep(max(1.0, refresh_at - time.monotonic()))
 
                 await self._refresh_access_token()
 
@@ -226,9 +262,10 @@ class FeishuChannel(BaseChannel):
                 raise Exception(f"获取 token 失败: {result}")
 
             self._access_token = result.get("tenant_access_token")
+            self._auth_headers = {"Authorization": f"Bearer {self._access_token}"}
             expire = result.get("expire", 7200)  # 默认 2 小时
 
-            self._token_expires_at = int(time.time()) + expire
+            self._token_expires_at = time.monotonic() + expire
 
             logger.info("飞书 access token 已刷新")
 
@@ -243,13 +280,9 @@ class FeishuChannel(BaseChannel):
 
         try:
             url = "https://open.feishu.cn/open-apis/im/v1/messages?receive_id_type=open_id"
-            headers = {
-                "Authorization": f"Bearer {self._access_token}",
-                "Content-Type": "application/json"
-            }
 
             # 构建消息内容（支持富文本）
-            message_content = json.dumps({"text": content})
+            message_content = json_dumps({"text": content})
 
             data = {
                 "receive_id": chat_id,
@@ -257,7 +290,8 @@ class FeishuChannel(BaseChannel):
                 "msg_type": "text"
             }
 
-            response = await self._http_client.post(url, headers=headers, json=data)
+            # Content-Type 由 json= 自动设置
+            response = await self._http_client.post(url, headers=self._auth_headers, json=data)
             result = response.json()
 
             if result.get("code") != 0:
@@ -293,19 +327,15 @@ class FeishuChannel(BaseChannel):
             return True
 
         try:
-            # 构建签名基础字符串
-            sign_base = f"{timestamp}{nonce}{body.decode()}".encode('utf-8')
+            # 构建签名基础字符串（直接拼接字节，避免 decode/encode 往返）
+            sign_base = timestamp.encode('utf-8') + nonce.encode('utf-8') + body
 
-            # 计算 HMAC-SHA256 签名
+            # 计算 HMAC-SHA256 签名（hmac.digest 直接调用 OpenSSL 的一次性实现）
             key = self.config.encrypt_key.encode('utf-8')
-            computed_signature = hmac.new(
-                key,
-                sign_base,
-                hashlib.sha256
-            ).hexdigest()
-
-            # 比对签名
-            return hmac.compare_digest(computed_signature, signature)
+            computed_signature = hmac.digest(key, sign_base, "sha256")
+
+            # 比对签名（原始字节比对，无需再转十六进制字符串）
+            return hmac.compare_digest(computed_signature, bytes.fromhex(signature))
 
         except Exception as e:
             logger.error(f"验证飞书签名失败: {e}")
@@ -1,5 +1,6 @@
 """飞书自定义机器人 Channel（基于 Webhook）."""
 
+import asyncio
 from typing import Any
 
 from loguru import logger
@@ -7,7 +8,7 @@ from loguru import logger
 from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
-from nanobot.channels.feishu_webhook import FeishuWebhookBot
+from nanobot.channels.feishu_webhook import AsyncFeishuWebhookBot, new_async_client
 from nanobot.config.schema import FeishuConfig
 
 
@@ -32,27 +33,29 @@ class FeishuWebhookChannel(BaseChannel):
         """
         super().__init__(config, bus)
         self.webhook_url = webhook_url
-        self._bot: FeishuWebhookBot | None = None
+        self._bot: AsyncFeishuWebhookBot | None = None
+        self._stop_event = asyncio.Event()
 
     async def start(self) -> None:
         """启动飞书 Webhook Channel."""
         self._running = True
-        self._bot = FeishuWebhookBot(self.webhook_url)
+        self._stop_event.clear()
+        # Channel 自己持有 HTTP 客户端，stop() 时通过 bot.aclose() 一起关闭
+        self._bot = AsyncFeishuWebhookBot(self.webhook_url, client=new_async_client())
 
         logger.info(f"飞书 Webhook Channel 已启动: {self.webhook_url[-20:]}")
 
         # 由于 webhook 模式只支持发送，不支持接收，
-        # 这里我们只需要保持运行状态
-        import asyncio
-        while self._running:
-            await asyncio.sleep(1)
+        # 这里我们只需要保持运行状态，直到 stop() 被调用
+        await self._stop_event.wait()
 
     async def stop(self) -> None:
         """停止飞书 Webhook Channel."""
         self._running = False
+        self._stop_event.set()
 
         if self._bot:
-            self._bot.close()
+            await self._bot.aclose()
             self._bot = None
 
         logger.info("飞书 Webhook Channel 已停止")
@@ -65,7 +68,7 @@ class FeishuWebhookChannel(BaseChannel):
 
         try:
             # 发送文本消息
-            self._bot.send_text(msg.content)
+            await self._bot.send_text(msg.content)
             logger.debug(f"飞书消息已发送: {msg.content[:50]}...")
         except Exception as e:
             logger.error(f"发送飞书消息失败: {e}")
@@ -83,7 +86,7 @@ class FeishuWebhookChannel(BaseChannel):
             return
 
         try:
-            self._bot.send_markdown(title, content)
+            await self._bot.send_markdown(title, content)
             logger.debug(f"飞书 Markdown 消息已发送: {title}")
         except Exception as e:
             logger.error(f"发送飞书 Markdown 消息失败: {e}")
@@ -1,10 +1,143 @@
 """飞书自定义机器人 Webhook 工具."""
 
-import json
-from typing import Any
+import asyncio
+import weakref
+from typing import Any, AsyncIterator, Iterable, Iterator
 
 import httpx
 
+from nanobot.utils.helpers import json_dumps, json_loads
+
+# 请求体由我们预先序列化（orjson 可用时更快），需要显式声明类型
+_JSON_HEADERS = {"Content-Type": "application/json; charset=utf-8"}
+
+# 进程内共享的 HTTP 客户端：复用 TCP/TLS 连接，避免每条消息都重新握手
+_shared_client: httpx.Client | None = None
+
+
+def _get_shared_client() -> httpx.Client:
+    """获取（必要时创建）共享的 HTTP 客户端."""
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        _shared_client = httpx.Client(
+            http2=True,
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        )
+    return _shared_client
+
+
+def close_shared_client() -> None:
+    """关闭共享的 HTTP 客户端（进程退出前调用）."""
+    global _shared_client
+    if _shared_client is not None:
+        _shared_client.close()
+        _shared_client = None
+
+
+# 异步客户端绑定在创建它的事件循环上，按事件循环分别共享；
+# 事件循环被回收后对应的条目自动消失
+_shared_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def new_async_client() -> httpx.AsyncClient:
+    """创建一个带连接池的 HTTP/2 异步客户端（与共享客户端配置相同），由调用方负责关闭."""
+    return httpx.AsyncClient(
+        http2=True,
+        timeout=10.0,
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+    )
+
+
+def _get_shared_async_client() -> httpx.AsyncClient:
+    """获取（必要时创建）当前事件循环共享的异步 HTTP 客户端."""
+    loop = asyncio.get_running_loop()
+    client = _shared_async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = new_async_client()
+        _shared_async_clients[loop] = client
+    return client
+
+
+async def aclose_shared_client() -> None:
+    """关闭当前事件循环共享的异步 HTTP 客户端（事件循环结束前调用）."""
+    client = _shared_async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+# 消息体模板（同步和异步机器人共用）
+# 静态结构预先写成 JSON 字符串，每次只序列化可变字段再填入 %s，
+# 不必每次构造多层嵌套的 dict 再整体序列化
+_TEXT_TEMPLATE = '{"msg_type":"text","content":{"text":%s}}'
+_POST_TEMPLATE = '{"msg_type":"post","content":{"post":{"zh_cn":{"title":%s,"content":[%s]}}}}'
+_CARD_TEMPLATE = '{"msg_type":"interactive","card":%s}'
+_MARKDOWN_TEMPLATE = (
+    '{"msg_type":"interactive","card":{"config":{"wide_screen_mode":true},'
+    '"header":{"title":{"content":%s,"tag":"plain_text"}},'
+    '"elements":[{"tag":"div","text":{"content":%s,"tag":"lark_md"}}]}}'
+)
+
+
+def _text_body(content: str) -> str:
+    return _TEXT_TEMPLATE % json_dumps(content)
+
+
+def _post_body(title: str, content: list[dict[str, Any]]) -> str:
+    return _POST_TEMPLATE % (json_dumps(title), json_dumps(content))
+
+
+def _card_body(card_content: dict[str, Any]) -> str:
+    return _CARD_TEMPLATE % json_dumps(card_content)
+
+
+# 元素数达到该值的卡片按元素逐个序列化并流式发送，不在内存里生成完整的请求体
+_STREAM_MIN_ELEMENTS = 64
+
+
+def _card_body_chunks(card_content: dict[str, Any]) -> Iterator[bytes]:
+    """逐个序列化卡片元素，按块生成请求体（elements 字段放在卡片最后）."""
+    head = json_dumps({k: v for k, v in card_content.items() if k != "elements"})
+    separator = b',"elements":[' if head != "{}" else b'"elements":['
+    yield b'{"msg_type":"interactive","card":' + head[:-1].encode() + separator
+    for i, element in enumerate(card_content["elements"]):
+        chunk = json_dumps(element).encode()
+        yield b"," + chunk if i else chunk
+    yield b"]}}"
+
+
+def _card_request_body(card_content: dict[str, Any]) -> str | Iterator[bytes]:
+    """小卡片直接序列化；元素很多的大卡片改为流式分块."""
+    elements = card_content.get("elements")
+    if isinstance(elements, list) and len(elements) >= _STREAM_MIN_ELEMENTS:
+        return _card_body_chunks(card_content)
+    return _card_body(card_content)
+
+
+async def _aiter_chunks(chunks: Iterable[bytes]) -> AsyncIterator[bytes]:
+    """AsyncClient 的流式请求体需要异步迭代器."""
+    for chunk in chunks:
+        yield chunk
+
+
+def _markdown_body(title: str, text: str) -> str:
+    return _MARKDOWN_TEMPLATE % (json_dumps(title), json_dumps(text))
+
+
+def _check_response(response: httpx.Response) -> dict[str, Any]:
+    """检查 webhook 响应：HTTP 错误直接抛出，不再解析响应体；否则检查业务返回码."""
+    if response.status_code >= 400:
+        response.raise_for_status()
+
+    result = json_loads(response.content)
+
+    if result.get("code") != 0:
+        raise Exception(f"发送消息失败: {result}")
+
+    return result
+
 
 class FeishuWebhookBot:
     """
@@ -14,15 +147,22 @@ class FeishuWebhookBot:
     适用于简单的消息推送场景。
     """
 
-    def __init__(self, webhook_url: str):
+    def __init__(self, webhook_url: str, client: httpx.Client | None = None):
         """
         初始化飞书自定义机器人.
 
         Args:
             webhook_url: 飞书自定义机器人的 webhook URL
+            client: 可选的 HTTP 客户端，默认使用模块内共享的连接池
         """
         self.webhook_url = webhook_url
-        self._client = httpx.Client(timeout=10.0)
+        self._owns_client = client is not None
+        self._client = client or _get_shared_client()
+
+    def _post(self, body: str | Iterator[bytes]) -> dict[str, Any]:
+        """发送已序列化（或按块生成）的消息体并检查返回结果."""
+        response = self._client.post(self.webhook_url, content=body, headers=_JSON_HEADERS)
+        return _check_response(response)
 
     def send_text(self, content: str) -> dict[str, Any]:
         """
@@ -34,18 +174,7 @@ class FeishuWebhookBot:
         Returns:
             API 响应结果
         """
-        data = {
-            "msg_type": "text",
-            "content": {"text": content}
-        }
-
-        response = self._client.post(self.webhook_url, json=data)
-        result = response.json()
-
-        if result.get("code") != 0:
-            raise Exception(f"发送消息失败: {result}")
-
-        return result
+        return self._post(_text_body(content))
 
     def send_post(
         self,
@@ -71,25 +200,7 @@ class FeishuWebhookBot:
                 ]
             )
         """
-        data = {
-            "msg_type": "post",
-            "content": {
-                "post": {
-                    "zh_cn": {
-                        "title": title,
-                        "content": [content]
-                    }
-                }
-            }
-        }
-
-        response = self._client.post(self.webhook_url, json=data)
-        result = response.json()
-
-        if result.get("code") != 0:
-            raise Exception(f"发送消息失败: {result}")
-
-        return result
+        return self._post(_post_body(title, content))
 
     def send_card(self, card_content: dict[str, Any]) -> dict[str, Any]:
         """
@@ -111,18 +222,7 @@ class FeishuWebhookBot:
             }
             bot.send_card(card)
         """
-        data = {
-            "msg_type": "interactive",
-            "card": card_content
-        }
-
-        response = self._client.post(self.webhook_url, json=data)
-        result = response.json()
-
-        if result.get("code") != 0:
-            raise Exception(f"发送消息失败: {result}")
-
-        return result
+        return self._post(_card_request_body(card_content))
 
     def send_markdown(self, title: str, text: str) -> dict[str, Any]:
         """
@@ -135,39 +235,12 @@ class FeishuWebhookBot:
         Returns:
             API 响应结果
         """
-        data = {
-            "msg_type": "interactive",
-            "card": {
-                "config": {"wide_screen_mode": True},
-                "header": {
-                    "title": {
-                        "content": title,
-                        "tag": "plain_text"
-                    }
-                },
-                "elements": [
-                    {
-                        "tag": "div",
-                        "text": {
-                            "content": text,
-                            "tag": "lark_md"
-                        }
-                    }
-                ]
-            }
-        }
-
-        response = self._client.post(self.webhook_url, json=data)
-        result = response.json()
-
-        if result.get("code") != 0:
-            raise Exception(f"发送消息失败: {result}")
-
-        return result
+        return self._post(_markdown_body(title, text))
 
     def close(self):
-        """关闭 HTTP 客户端."""
-        self._client.close()
+        """关闭 HTTP 客户端（共享客户端不会被关闭）."""
+        if self._owns_client:
+            self._client.close()
 
     def __enter__(self):
         return self
@@ -176,6 +249,63 @@ class FeishuWebhookBot:
         self.close()
 
 
+class AsyncFeishuWebhookBot:
+    """
+    飞书自定义机器人 Webhook 异步客户端.
+
+    与 FeishuWebhookBot 接口相同，但基于 httpx.AsyncClient，
+    在 asyncio 代码中发送消息时不会阻塞事件循环。
+    """
+
+    def __init__(self, webhook_url: str, client: httpx.AsyncClient | None = None):
+        """
+        初始化飞书自定义机器人.
+
+        Args:
+            webhook_url: 飞书自定义机器人的 webhook URL
+            client: 可选的异步 HTTP 客户端，默认使用当前事件循环共享的连接池
+        """
+        self.webhook_url = webhook_url
+        self._owns_client = client is not None
+        # 未指定时每次发送再取共享客户端，保证与当前事件循环匹配
+        self._client = client
+
+    async def _post(self, body: str | Iterator[bytes]) -> dict[str, Any]:
+        """发送已序列化（或按块生成）的消息体并检查返回结果."""
+        if not isinstance(body, str):
+            body = _aiter_chunks(body)
+        client = self._client or _get_shared_async_client()
+        response = await client.post(self.webhook_url, content=body, headers=_JSON_HEADERS)
+        return _check_response(response)
+
+    async def send_text(self, content: str) -> dict[str, Any]:
+        """发送文本消息，参见 FeishuWebhookBot.send_text."""
+        return await self._post(_text_body(content))
+
+    async def send_post(self, title: str, content: list[dict[str, Any]]) -> dict[str, Any]:
+        """发送富文本消息，参见 FeishuWebhookBot.send_post."""
+        return await self._post(_post_body(title, content))
+
+    async def send_card(self, card_content: dict[str, Any]) -> dict[str, Any]:
+        """发送交互式卡片消息，参见 FeishuWebhookBot.send_card."""
+        return await self._post(_card_request_body(card_content))
+
+    async def send_markdown(self, title: str, text: str) -> dict[str, Any]:
+        """发送 Markdown 消息，参见 FeishuWebhookBot.send_markdown."""
+        return await self._post(_markdown_body(title, text))
+
+    async def aclose(self):
+        """关闭 HTTP 客户端（共享客户端不会被关闭）."""
+        if self._owns_client:
+            await self._client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+
 # 便捷函数
 def send_feishu_message(webhook_url: str, message: str) -> dict[str, Any]:
     """
@@ -194,5 +324,4 @@ def send_feishu_message(webhook_url: str, message: str) -> dict[str, Any]:
             "Hello from nanobot!"
         )
     """
-    with FeishuWebhookBot(webhook_url) as bot:
-        return bot.send_text(message)
+    return FeishuWebhookBot(webhook_url).send_text(message)
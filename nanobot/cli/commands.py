@@ -205,6 +205,9 @@ def gateway(
         brave_api_key=config.tools.web.search.api_key or None,
         exec_config=config.tools.exec,
         mcp_config=config.mcp,
+        response_cache_size=config.agents.defaults.response_cache_size,
+        max_history=config.agents.defaults.max_history,
+        fast_replies=config.agents.defaults.fast_replies,
     )
     
     # Create cron service
@@ -718,7 +721,7 @@ def mcp_list_clients():
 
     config = load_config()
 
-    clients = config.mcp.clients.model_dump(exclude_unset=True)
+    clients = config.mcp.clients
 
     if not clients:
         console.print("No MCP clients configured.")
@@ -731,18 +734,19 @@ def mcp_list_clients():
     table.add_column("Config", style="yellow")
 
     for name, client_config in clients.items():
-        enabled = "✓" if client_config.get("enabled", False) else "✗"
-        client_type = client_config.get("type", "stdio")
+        enabled = "✓" if client_config.enabled else "✗"
+        client_type = client_config.type
 
         # 根据类型显示不同的配置信息
-        if client_type in ("http", "streamable_http"):
-            url = client_config.get("url", "[dim]N/A[/dim]")
-            headers_count = len(client_config.get("headers", {}))
-            config_info = f"URL: {url}\nHeaders: {headers_count}"
-        else:  # stdio
-            command = client_config.get("command", "[dim]N/A[/dim]")
-            args = " ".join(client_config.get("args", [])) or "[dim]N/A[/dim]"
-            config_info = f"Cmd: {command}\nArgs: {args}"
+        match client_type:
+            case "http" | "streamable_http":
+                url = client_config.url or "[dim]N/A[/dim]"
+                headers_count = len(client_config.headers)
+                config_info = f"URL: {url}\nHeaders: {headers_count}"
+            case _:  # stdio
+                command = client_config.command or "[dim]N/A[/dim]"
+                args = " ".join(client_config.args) or "[dim]N/A[/dim]"
+                config_info = f"Cmd: {command}\nArgs: {args}"
 
         table.add_row(name, client_type, enabled, config_info)
 
@@ -761,31 +765,27 @@ def mcp_test_client(
     config = load_config()
 
     # Get client config
-    clients_dict = config.mcp.clients.model_dump(exclude_unset=True)
-    if client_name not in clients_dict:
+    client_config = config.mcp.clients.get(client_name)
+    if client_config is None:
         console.print(f"[red]Client '{client_name}' not found in config[/red]")
         raise typer.Exit(1)
 
-    client_config = clients_dict[client_name]
-
-    if not client_config.get("enabled", False):
+    if not client_config.enabled:
         console.print(f"[yellow]Client '{client_name}' is disabled[/yellow]")
         raise typer.Exit(1)
 
-    # 根据类型验证配置
-    client_type = client_config.get("type", "stdio")
+    # 根据类型验证配置（type 已在加载配置时校验）
+    client_type = client_config.type
 
-    if client_type == "stdio":
-        if not client_config.get("command"):
-            console.print(f"[red]Client '{client_name}' has no command configured[/red]")
-            raise typer.Exit(1)
-    elif client_type in ("http", "streamable_http"):
-        if not client_config.get("url"):
-            console.print(f"[red]Client '{client_name}' has no url configured[/red]")
-            raise typer.Exit(1)
-    else:
-        console.print(f"[red]Client '{client_name}' has unsupported type: {client_type}[/red]")
-        raise typer.Exit(1)
+    match client_type:
+        case "stdio":
+            if not client_config.command:
+                console.print(f"[red]Client '{client_name}' has no command configured[/red]")
+                raise typer.Exit(1)
+        case "http" | "streamable_http":
+            if not client_config.url:
+                console.print(f"[red]Client '{client_name}' has no url configured[/red]")
+                raise typer.Exit(1)
 
     console.print(f"{__logo__} Testing MCP client '{client_name}' (type: {client_type})...")
 
@@ -798,7 +798,7 @@ def mcp_test_client(
             await client.connect()
 
             # List tools
-            tools = await client.list_tools()
+            tools = await client.list_tools() or []
             console.print(f"\n[green]✓[/green] Connected successfully!")
             console.print(f"Found {len(tools)} tool(s):")
 
@@ -828,8 +828,11 @@ def mcp_import(
 ):
     """Import MCP configuration from Claude Desktop."""
     from nanobot.config.loader import load_config, save_config
-    from nanobot.config.importer import load_claude_desktop_mcp_config, get_claude_desktop_config_path
-    from nanobot.config.schema import MCPClientConfig, MCPClientsConfig
+    from nanobot.config.importer import (
+        get_claude_desktop_config_path,
+        import_mcp_config,
+        load_claude_desktop_mcp_config,
+    )
 
     config_path = get_claude_desktop_config_path()
 
@@ -855,29 +858,20 @@ def mcp_import(
     config = load_config()
 
     # 检查是否有现有配置
-    existing_clients = config.mcp.clients.model_dump(exclude_unset=True)
-    if existing_clients and not overwrite:
+    if config.mcp.clients and not overwrite:
         console.print("\n[yellow]Warning: Existing MCP clients config found[/yellow]")
         if not typer.confirm("Do you want to continue? This will merge with existing config."):
             raise typer.Exit(0)
 
     # 导入配置
-    imported = {}
-    for name, server_config in mcp_servers.items():
-        imported[name] = {
-            "enabled": True,
-            "command": server_config.get("command"),
-            "args": server_config.get("args", []),
-            "env": server_config.get("env", {}),
-        }
+    imported = import_mcp_config(mcp_servers)
 
     # 合并或替换配置
     if overwrite:
-        config.mcp.clients = MCPClientsConfig(**imported)
+        config.mcp.clients = imported
     else:
         # 合并：保留 nanobot 特有的配置，添加/更新从 Claude Desktop 导入的
-        for name, client_config in imported.items():
-            setattr(config.mcp.clients, name, MCPClientConfig(**client_config))
+        config.mcp.clients.root.update(imported.root)
 
     # 保存配置
     save_config(config)
@@ -1,33 +1,56 @@
 """Import MCP configuration from Claude Desktop."""
 
-import json
+import functools
+import os
 import platform
 from pathlib import Path
 
+from nanobot.utils.helpers import json_loads
 
+# Claude Desktop config location relative to the home directory, per OS
+_CLAUDE_DESKTOP_CONFIG = {
+    "Darwin": "Library/Application Support/Claude/claude_desktop_config.json",  # macOS
+    "Windows": "AppData/Roaming/Claude/claude_desktop_config.json",
+    "Linux": ".config/Claude/claude_desktop_config.json",
+}
+
+
+@functools.cache
 def get_claude_desktop_config_path() -> Path:
-    """Get Claude Desktop config path based on OS."""
+    """Get Claude Desktop config path based on OS (resolved once per process)."""
     system = platform.system()
-    if system == "Darwin":  # macOS
-        return Path.home() / "Library" / "Application Support" / "Claude" / "claude_desktop_config.json"
-    elif system == "Windows":
-        return Path.home() / "AppData" / "Roaming" / "Claude" / "claude_desktop_config.json"
-    elif system == "Linux":
-        return Path.home() / ".config" / "Claude" / "claude_desktop_config.json"
-    else:
+    relative = _CLAUDE_DESKTOP_CONFIG.get(system)
+    if relative is None:
         raise ValueError(f"Unsupported platform: {system}")
+    return Path(os.path.join(os.path.expanduser("~"), relative))
+
+
+# (path, mtime_ns, mcpServers) of the last parsed Claude Desktop config
+_CACHE: tuple[Path, int, dict] | None = None
+
+
+def invalidate_cache() -> None:
+    """Forget the cached Claude Desktop config."""
+    global _CACHE
+    _CACHE = None
 
 
 def load_claude_desktop_mcp_config() -> dict | None:
-    """Load MCP config from Claude Desktop."""
+    """Load MCP config from Claude Desktop (re-parsed only when the file changes)."""
+    global _CACHE
     config_path = get_claude_desktop_config_path()
-    if not config_path.exists():
+    try:
+        mtime_ns = config_path.stat().st_mtime_ns
+    except FileNotFoundError:
         return None
 
-    with open(config_path) as f:
-        data = json.load(f)
+    if _CACHE and _CACHE[0] == config_path and _CACHE[1] == mtime_ns:
+        return _CACHE[2]
 
-    return data.get("mcpServers", {})
+    data = json_loads(config_path.read_bytes())
+    servers = data.get("mcpServers", {})
+    _CACHE = (config_path, mtime_ns, servers)
+    return servers
 
 
 def import_mcp_config(cloud_config: dict | None = None) -> "MCPClientsConfig":
@@ -39,7 +62,7 @@ def import_mcp_config(cloud_config: dict | None = None) -> "MCPClientsConfig":
     Returns:
         MCPClientsConfig instance
     """
-    from nanobot.config.schema import MCPClientConfig, MCPClientsConfig
+    from nanobot.config.schema import MCPClientsConfig, MCPClientStdioConfig
 
     mcp_servers = cloud_config or load_claude_desktop_mcp_config()
     if not mcp_servers:
@@ -47,11 +70,11 @@ def import_mcp_config(cloud_config: dict | None = None) -> "MCPClientsConfig":
 
     clients = {}
     for name, server_config in mcp_servers.items():
-        clients[name] = {
-            "enabled": True,  # 导入的客户端默认启用
-            "command": server_config.get("command"),
-            "args": server_config.get("args", []),
-            "env": server_config.get("env", {}),
-        }
-
-    return MCPClientsConfig(**clients)
+        clients[name] = MCPClientStdioConfig(
+            enabled=True,  # 导入的客户端默认启用
+            command=server_config.get("command"),
+            args=server_config.get("args", []),
+            env=server_config.get("env", {}),
+        )
+
+    return MCPClientsConfig(clients)
@@ -1,8 +1,10 @@
 """Configuration schema using Pydantic."""
 
+from functools import cached_property
 from pathlib import Path
-from typing import Literal
-from pydantic import BaseModel, Field
+from typing import Annotated, Any, Iterator, Literal
+from loguru import logger
+from pydantic import BaseModel, BeforeValidator, Field, RootModel, TypeAdapter, ValidationError, model_validator
 from pydantic_settings import BaseSettings
 
 
@@ -20,12 +22,32 @@ class TelegramConfig(BaseModel):
     allow_from: list[str] = Field(default_factory=list)  # Allowed user IDs or usernames
 
 
+class FeishuConfig(BaseModel):
+    """飞书 channel configuration."""
+    enabled: bool = False
+    app_id: str = ""
+    app_secret: str = ""
+    verify_token: str = ""
+    encrypt_key: str = ""  # Used to verify webhook signatures
+    webhook_host: str = "0.0.0.0"
+    webhook_port: int = 18792
+    webhook_path: str = "/feishu/webhook"
+    allow_from: list[str] = Field(default_factory=list)  # Allowed open_ids
+    batch_max_size: int = 50  # Max inbound events handled per batch
+
+
 class ChannelsConfig(BaseModel):
     """Configuration for chat channels."""
     whatsapp: WhatsAppConfig = Field(default_factory=WhatsAppConfig)
     telegram: TelegramConfig = Field(default_factory=TelegramConfig)
 
 
+class FastReplyConfig(BaseModel):
+    """Canned reply for messages matching a regex, answered without calling the LLM."""
+    pattern: str  # Matched against the whole (stripped) message, e.g. "(?i)ping"
+    reply: str
+
+
 class AgentDefaults(BaseModel):
     """Default agent configuration."""
     workspace: str = "~/.nanobot/workspace"
@@ -33,6 +55,9 @@ class AgentDefaults(BaseModel):
     max_tokens: int = 8192
     temperature: float = 0.7
     max_tool_iterations: int = 20
+    response_cache_size: int = 128  # Cached final LLM responses, 0 disables
+    max_history: int = 50  # Session messages sent to the LLM as history
+    fast_replies: list[FastReplyConfig] = Field(default_factory=list)
 
 
 class AgentsConfig(BaseModel):
@@ -107,7 +132,7 @@ class MCPClientHTTPConfig(BaseModel):
     """HTTP 类型的 MCP 客户端配置 (SSE)."""
     type: Literal["http"] = "http"
     enabled: bool = False
-    url: str
+    url: str | None = None
     headers: dict[str, str] = Field(default_factory=dict)
     timeout: float = 5.0
     sse_read_timeout: float = 300.0
@@ -117,7 +142,7 @@ class MCPClientStreamableHTTPConfig(BaseModel):
     """StreamableHTTP 类型的 MCP 客户端配置 (direct HTTP JSON-RPC)."""
     type: Literal["streamable_http"] = "streamable_http"
     enabled: bool = False
-    url: str
+    url: str | None = None
     headers: dict[str, str] = Field(default_factory=dict)
 
 
@@ -125,15 +150,63 @@ class MCPClientStreamableHTTPConfig(BaseModel):
 MCPClientConfig = MCPClientStdioConfig | MCPClientHTTPConfig | MCPClientStreamableHTTPConfig
 
 
-class MCPClientsConfig(BaseModel):
-    """MCP clients configuration (nanobot connects to external servers)."""
-    # 使用 dict 类型以支持动态添加任意类型的客户端
-    # 在使用时通过 model_dump() 获取字典并根据 type 字段区分
-    filesystem: dict = Field(default_factory=dict)
-    github: dict = Field(default_factory=dict)
+def _default_client_type(value: Any) -> Any:
+    """旧配置可以省略 type，默认为 stdio 保持向后兼容."""
+    if isinstance(value, dict) and "type" not in value:
+        return {**value, "type": "stdio"}
+    return value
 
-    class Config:
-        extra = "allow"  # Allow arbitrary additional clients
+
+# 按 type 字段区分的联合类型，加载配置时一次性校验
+MCPClientEntry = Annotated[
+    MCPClientConfig,
+    Field(discriminator="type"),
+    BeforeValidator(_default_client_type),
+]
+
+_client_config_adapter: TypeAdapter[MCPClientConfig] = TypeAdapter(MCPClientEntry)
+
+
+def parse_mcp_client_config(data: dict[str, Any]) -> MCPClientConfig:
+    """Validate a raw client config dict into the matching config model."""
+    return _client_config_adapter.validate_python(data)
+
+
+class MCPClientsConfig(RootModel[dict[str, MCPClientEntry]]):
+    """MCP clients configuration (nanobot connects to external servers), keyed by client name."""
+    root: dict[str, MCPClientEntry] = Field(default_factory=dict)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _skip_invalid_clients(cls, data: Any) -> Any:
+        """单个客户端配置无效时只跳过该客户端，不影响整个配置的加载."""
+        if not isinstance(data, dict):
+            return data
+        valid = {}
+        for name, entry in data.items():
+            try:
+                valid[name] = parse_mcp_client_config(entry)
+            except ValidationError as e:
+                logger.warning("MCP client '{}' has invalid config, skipping: {}", name, e)
+        return valid
+
+    def __iter__(self) -> Iterator[str]:  # type: ignore[override]
+        return iter(self.root)
+
+    def __getitem__(self, name: str) -> MCPClientConfig:
+        return self.root[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.root
+
+    def __len__(self) -> int:
+        return len(self.root)
+
+    def get(self, name: str) -> MCPClientConfig | None:
+        return self.root.get(name)
+
+    def items(self):
+        return self.root.items()
 
 
 class MCPConfig(BaseModel):
@@ -141,6 +214,11 @@ class MCPConfig(BaseModel):
     servers: MCPServerConfig = Field(default_factory=MCPServerConfig)
     clients: MCPClientsConfig = Field(default_factory=MCPClientsConfig)
 
+    @cached_property
+    def enabled_clients(self) -> dict[str, MCPClientConfig]:
+        """Enabled client configs, computed once per config object."""
+        return {name: client for name, client in self.clients.items() if client.enabled}
+
 
 class Config(BaseSettings):
     """Root configuration for nanobot."""
@@ -151,13 +229,24 @@ class Config(BaseSettings):
     tools: ToolsConfig = Field(default_factory=ToolsConfig)
     mcp: MCPConfig = Field(default_factory=MCPConfig)
     
-    @property
+    # The derived values below are computed once per config object; configs
+    # are loaded at startup and not mutated afterwards.
+
+    @cached_property
     def workspace_path(self) -> Path:
         """Get expanded workspace path."""
         return Path(self.agents.defaults.workspace).expanduser()
     
     def get_api_key(self) -> str | None:
         """Get API key in priority order: OpenRouter > Anthropic > OpenAI > Gemini > Zhipu > Groq > vLLM."""
+        return self._api_key
+    
+    def get_api_base(self) -> str | None:
+        """Get API base URL if using OpenRouter, Zhipu or vLLM."""
+        return self._api_base
+    
+    @cached_property
+    def _api_key(self) -> str | None:
         return (
             self.providers.openrouter.api_key or
             self.providers.anthropic.api_key or
@@ -169,8 +258,8 @@ class Config(BaseSettings):
             None
         )
     
-    def get_api_base(self) -> str | None:
-        """Get API base URL if using OpenRouter, Zhipu or vLLM."""
+    @cached_property
+    def _api_base(self) -> str | None:
         if self.providers.openrouter.api_key:
             return self.providers.openrouter.api_base or "https://openrouter.ai/api/v1"
         if self.providers.zhipu.api_key:
@@ -1,198 +1,175 @@
 """MCP client manager for connecting to external MCP servers."""
 
 import asyncio
+import os
+import shlex
+import subprocess
 from contextlib import asynccontextmanager
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, ClassVar, Mapping
 
+import httpx
 from loguru import logger
 
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 from mcp.client.sse import sse_client
 from mcp.client.streamable_http import streamable_http_client
+from pydantic import ValidationError
+
+from nanobot.config.schema import MCPClientConfig, parse_mcp_client_config
+
+
+# Config field each client type needs before it can connect
+REQUIRED_FIELDS: dict[str, str] = {
+    "stdio": "command",
+    "http": "url",
+    "streamable_http": "url",
+}
 
 
 class MCPClient:
     """Manages a single MCP server connection."""
 
-    def __init__(self, name: str, config: dict, silent: bool = False):
+    # client type -> method opening that transport, populated after the class body
+    _CONNECTORS: ClassVar[dict[str, Callable[["MCPClient"], Awaitable[tuple]]]]
+
+    def __init__(
+        self,
+        name: str,
+        config: MCPClientConfig,
+        silent: bool = False,
+        http_transport: httpx.AsyncBaseTransport | None = None,
+    ):
         """
         Initialize MCP client.
 
         Args:
             name: Client name for identification
-            config: Client configuration dict (supports 'stdio' and 'http' types)
+            config: Validated client configuration (stdio, http or streamable_http)
             silent: If True, suppress subprocess stdout/stderr for stdio clients
+            http_transport: Optional shared connection pool for streamable_http clients
         """
         self.name = name
         self.config = config
-        self.client_type = config.get("type", "stdio")  # 默认为 stdio 保持向后兼容
+        self.client_type = config.type
         self.silent = silent
         self.session: ClientSession | None = None
         self._transport_context = None
         self._session_context = None
+        self._http_transport = http_transport
+        self._http_client: httpx.AsyncClient | None = None
 
     async def connect(self) -> None:
         """Connect to the MCP server."""
-        if self.client_type == "stdio":
-            await self._connect_stdio()
-        elif self.client_type == "http":
-            await self._connect_http()
-        elif self.client_type == "streamable_http":
-            await self._connect_streamable_http()
-        else:
+        connector = self._CONNECTORS.get(self.client_type)
+        if connector is None:
             raise ValueError(f"Unsupported MCP client type: {self.client_type}")
 
-    async def _connect_stdio(self) -> None:
-        """Connect to MCP server via stdio."""
-        import os
-        import subprocess
-
         try:
-            logger.info(f"Connecting to MCP server '{self.name}' (stdio)...")
-
-            command = self.config.get("command")
-            if not command:
-                raise ValueError(f"stdio client '{self.name}' missing 'command' field")
-
-            args = self.config.get("args", [])
-            env = self.config.get("env", {})
-
-            # Merge environment variables with current environment
-            merged_env = os.environ.copy()
-            if env:
-                merged_env.update(env)
-
-            # In silent mode, wrap command to redirect stderr to /dev/null
-            if self.silent:
-                # Create a wrapper script that redirects stderr
-                if os.name == 'nt':  # Windows
-                    # On Windows, use NUL
-                    wrapper_command = ['cmd', '/c', command + ' 2>NUL'] + [f'"{arg}"' if ' ' in arg else arg for arg in args]
-                    # Remove original args since they're now in the wrapper command
-                    args = []
-                    command = wrapper_command[0]
-                    wrapper_command = wrapper_command[2:]  # Skip 'cmd' and '/c'
-                    # This is complex, let's use a simpler approach
-                    # Reset to original and use shell=True
-                    wrapper_command = command + ' ' + ' '.join([f'"{arg}"' if ' ' in arg else arg for arg in args]) + ' 2>NUL'
-                    server_params = StdioServerParameters(
-                        command=wrapper_command,
-                        args=[],
-                        env=merged_env,
-                    )
-                else:  # Unix/Linux/macOS
-                    # On Unix, use sh -c to redirect stderr
-                    shell_command = command + ' ' + ' '.join([shlex.quote(arg) for arg in args]) + ' 2>/dev/null'
-                    import shlex
-                    server_params = StdioServerParameters(
-                        command='sh',
-                        args=['-c', shell_command],
-                        env=merged_env,
-                    )
-            else:
-                # Create stdio server parameters normally
-                server_params = StdioServerParameters(
-                    command=command,
-                    args=args,
-                    env=merged_env,
-                )
-
-            # Connect to server
-            self._transport_context = stdio_client(server_params)
-            stdio_transport = await self._transport_context.__aenter__()
-
-            # Create session
-            self._session_context = ClientSession(stdio_transport[0], stdio_transport[1])
-            self.session = await self._session_context.__aenter__()
-
-            # Initialize session
-            await self.session.initialize()
-
-            logger.info(f"Connected to MCP server '{self.name}' (stdio)")
+            logger.info("Connecting to MCP server '{}' ({})...", self.name, self.client_type)
+            streams = await connector(self)
+            await self._initialize(streams)
+            logger.info("Connected to MCP server '{}' ({})", self.name, self.client_type)
 
         except Exception as e:
-            logger.error(f"Failed to connect to MCP server '{self.name}': {e}")
+            logger.error("Failed to connect to MCP server '{}': {}", self.name, e)
             self.session = None
             raise
 
-    async def _connect_http(self) -> None:
-        """Connect to MCP server via HTTP/SSE."""
-        try:
-            logger.info(f"Connecting to MCP server '{self.name}' (http)...")
-
-            url = self.config.get("url")
-            if not url:
-                raise ValueError(f"http client '{self.name}' missing 'url' field")
-
-            headers = self.config.get("headers", {})
-            timeout = self.config.get("timeout", 5.0)
-            sse_read_timeout = self.config.get("sse_read_timeout", 300.0)
-
-            # Connect to server via SSE
-            self._transport_context = sse_client(
-                url=url,
-                headers=headers,
-                timeout=timeout,
-                sse_read_timeout=sse_read_timeout,
-            )
-            sse_transport = await self._transport_context.__aenter__()
-
-            # Create session
-            self._session_context = ClientSession(sse_transport[0], sse_transport[1])
-            self.session = await self._session_context.__aenter__()
-
-            # Initialize session
-            await self.session.initialize()
-
-            logger.info(f"Connected to MCP server '{self.name}' (http)")
-
-        except Exception as e:
-            logger.error(f"Failed to connect to MCP server '{self.name}': {e}")
-            self.session = None
-            raise
-
-    async def _connect_streamable_http(self) -> None:
-        """Connect to MCP server via StreamableHTTP (direct HTTP JSON-RPC)."""
-        import httpx
-
-        try:
-            logger.info(f"Connecting to MCP server '{self.name}' (streamable_http)...")
-
-            url = self.config.get("url")
-            if not url:
-                raise ValueError(f"streamable_http client '{self.name}' missing 'url' field")
-
-            headers = self.config.get("headers", {})
-
-            # Create httpx client with headers
-            http_client = httpx.AsyncClient(
-                headers=headers,
-                timeout=httpx.Timeout(30.0)
-            )
-
-            # Connect to server via StreamableHTTP
-            # Use terminate_on_close=False to prevent DELETE request during cleanup
-            self._transport_context = streamable_http_client(
-                url=url,
-                http_client=http_client,
-                terminate_on_close=False
+    async def _initialize(self, streams: tuple) -> None:
+        """Open the MCP session over the transport streams and run the initialize handshake."""
+        # Create session
+        self._session_context = ClientSession(streams[0], streams[1])
+        self.session = await self._session_context.__aenter__()
+
+        # Initialize session
+        await self.session.initialize()
+
+    async def _connect_stdio(self) -> tuple:
+        """Open the stdio transport to the MCP server."""
+        command = self.config.command
+        if not command:
+            raise ValueError(f"stdio client '{self.name}' missing 'command' field")
+
+        args = self.config.args
+        env = self.config.env
+
+        # Merge environment variables with current environment. The full
+        # environment is always passed: with env=None the SDK would only
+        # forward a small whitelist (HOME, PATH, ...) to the server.
+        merged_env = {**os.environ, **env} if env else dict(os.environ)
+
+        # In silent mode, wrap command to redirect stderr to /dev/null
+        if self.silent:
+            # Create a wrapper script that redirects stderr
+            if os.name == 'nt':  # Windows
+                # On Windows, use NUL
+                wrapper_command = subprocess.list2cmdline([command, *args]) + ' 2>NUL'
+                server_params = StdioServerParameters(
+                    command=wrapper_command,
+                    args=[],
+                    env=merged_env,
+                )
+            else:  # Unix/Linux/macOS
+                # On Unix, use sh -c to redirect stderr
+                shell_command = " ".join([command, *map(shlex.quote, args), "2>/dev/null"])
+                server_params = StdioServerParameters(
+                    command='sh',
+                    args=['-c', shell_command],
+                    env=merged_env,
+                )
+        else:
+            # Create stdio server parameters normally
+            server_params = StdioServerParameters(
+                command=command,
+                args=args,
+                env=merged_env,
             )
-            streams = await self._transport_context.__aenter__()
-
-            # Create session
-            self._session_context = ClientSession(streams[0], streams[1])
-            self.session = await self._session_context.__aenter__()
-
-            # Initialize session
-            await self.session.initialize()
 
-            logger.info(f"Connected to MCP server '{self.name}' (streamable_http)")
-
-        except Exception as e:
-            logger.error(f"Failed to connect to MCP server '{self.name}': {e}")
-            self.session = None
-            raise
+        # Connect to server
+        self._transport_context = stdio_client(server_params)
+        return await self._transport_context.__aenter__()
+
+    async def _connect_http(self) -> tuple:
+        """Open the HTTP/SSE transport to the MCP server."""
+        url = self.config.url
+        if not url:
+            raise ValueError(f"http client '{self.name}' missing 'url' field")
+
+        # Connect to server via SSE
+        self._transport_context = sse_client(
+            url=url,
+            headers=self.config.headers,
+            timeout=self.config.timeout,
+            sse_read_timeout=self.config.sse_read_timeout,
+        )
+        return await self._transport_context.__aenter__()
+
+    async def _connect_streamable_http(self) -> tuple:
+        """Open the StreamableHTTP transport (direct HTTP JSON-RPC) to the MCP server."""
+        url = self.config.url
+        if not url:
+            raise ValueError(f"streamable_http client '{self.name}' missing 'url' field")
+
+        # Create httpx client with headers. Headers are per server, so each
+        # client gets its own AsyncClient, but when the manager provides a
+        # shared transport they all draw from one connection pool.
+        http_client = httpx.AsyncClient(
+            headers=self.config.headers,
+            timeout=httpx.Timeout(30.0),
+            transport=self._http_transport,
+        )
+        self._http_client = http_client
+
+        # Connect to server via StreamableHTTP
+        # Use terminate_on_close=False to prevent DELETE request during cleanup
+        self._transport_context = streamable_http_client(
+            url=url,
+            http_client=http_client,
+            terminate_on_close=False
+        )
+        return await self._transport_context.__aenter__()
 
     async def disconnect(self) -> None:
         """Disconnect from the MCP server."""
@@ -203,7 +180,7 @@ class MCPClient:
                 except RuntimeError as e:
                     if "cancel scope" in str(e):
                         # Ignore cancel scope errors during event loop shutdown
-                        logger.debug(f"Ignoring cancel scope error during session cleanup: {e}")
+                        logger.debug("Ignoring cancel scope error during session cleanup: {}", e)
                     else:
                         raise
                 self._session_context = None
@@ -214,36 +191,41 @@ class MCPClient:
                 except RuntimeError as e:
                     if "cancel scope" in str(e):
                         # Ignore cancel scope errors during event loop shutdown
-                        logger.debug(f"Ignoring cancel scope error during transport cleanup: {e}")
+                        logger.debug("Ignoring cancel scope error during transport cleanup: {}", e)
                     else:
                         raise
                 self._transport_context = None
 
+            # A shared transport is closed by the manager, not per client
+            if self._http_client and self._http_transport is None:
+                await self._http_client.aclose()
+            self._http_client = None
+
             self.session = None
-            logger.info(f"Disconnected from MCP server '{self.name}'")
+            logger.info("Disconnected from MCP server '{}'", self.name)
 
         except Exception as e:
             # Log but don't raise during cleanup
-            logger.debug(f"Error during disconnect from '{self.name}': {e}")
+            logger.debug("Error during disconnect from '{}': {}", self.name, e)
             self.session = None
 
-    async def list_tools(self) -> list[dict]:
+    async def list_tools(self) -> list[dict] | None:
         """
         List available tools from the MCP server.
 
         Returns:
-            List of tool definitions
+            List of tool definitions, or None if they could not be fetched
         """
         if not self.session:
-            logger.warning(f"MCP server '{self.name}' not connected")
-            return []
+            logger.warning("MCP server '{}' not connected", self.name)
+            return None
 
         try:
             response = await self.session.list_tools()
             return response.tools if hasattr(response, "tools") else []
         except Exception as e:
-            logger.error(f"Error listing tools from MCP server '{self.name}': {e}")
-            return []
+            logger.error("Error listing tools from MCP server '{}': {}", self.name, e)
+            return None
 
     async def call_tool(self, tool_name: str, arguments: dict) -> Any:
         """
@@ -262,68 +244,204 @@ class MCPClient:
         return await self.session.call_tool(tool_name, arguments)
 
 
+MCPClient._CONNECTORS = {
+    "stdio": MCPClient._connect_stdio,
+    "http": MCPClient._connect_http,
+    "streamable_http": MCPClient._connect_streamable_http,
+}
+
+
 class MCPClientManager:
     """Manages multiple MCP client connections."""
 
-    def __init__(self, clients_config: dict[str, dict], silent: bool = False):
+    def __init__(
+        self,
+        clients_config: dict[str, MCPClientConfig | dict],
+        silent: bool = False,
+        start_timeout: float | None = 60.0,
+    ):
         """
         Initialize MCP client manager.
 
         Args:
-            clients_config: Dictionary of client name -> client config
-                Each config has: command, args, env
+            clients_config: Dictionary of client name -> client config model
+                (e.g. MCPConfig.enabled_clients). Raw dicts are still accepted and
+                validated once here; invalid ones are skipped.
             silent: If True, suppress MCP server stdout/stderr output
+            start_timeout: Seconds to wait for each server to connect, None to wait forever
         """
-        self.clients_config = clients_config
+        self.clients_config: dict[str, MCPClientConfig] = {}
+        for name, config in clients_config.items():
+            if isinstance(config, dict):
+                try:
+                    config = parse_mcp_client_config(config)
+                except ValidationError as e:
+                    logger.warning("MCP client '{}' has invalid config, skipping: {}", name, e)
+                    continue
+            self.clients_config[name] = config
         self.clients: dict[str, MCPClient] = {}
         self.silent = silent
+        self.start_timeout = start_timeout
+        self._version = 0
+        # Connection pool shared by all streamable_http clients, created on first use
+        self._http_transport: httpx.AsyncHTTPTransport | None = None
+        # Tool lists fetched per server, filled on first access
+        self._tool_cache: dict[str, list[dict]] = {}
+        # Per-server locks, so a slow server only delays callers waiting on it
+        self._tool_locks: dict[str, asyncio.Lock] = {}
+        # One long-lived task per connected client, see _run_client
+        self._client_tasks: dict[str, asyncio.Task] = {}
+        self._stop_event = asyncio.Event()
 
     async def start(self) -> None:
-        """Connect to all enabled MCP servers."""
+        """Connect to all enabled MCP servers concurrently."""
+        pending: list[MCPClient] = []
         for name, config in self.clients_config.items():
-            if not config.get("enabled", False):
+            if not config.enabled:
                 continue
 
             # 根据类型验证配置
-            client_type = config.get("type", "stdio")
-
-            if client_type == "stdio":
-                if not config.get("command"):
-                    logger.warning(f"MCP client '{name}' has no command configured, skipping")
-                    continue
-            elif client_type == "http" or client_type == "streamable_http":
-                if not config.get("url"):
-                    logger.warning(f"MCP client '{name}' has no url configured, skipping")
-                    continue
-            else:
-                logger.warning(f"MCP client '{name}' has unsupported type: {client_type}, skipping")
+            required = REQUIRED_FIELDS[config.type]
+            if not getattr(config, required):
+                logger.warning("MCP client '{}' has no {} configured, skipping", name, required)
                 continue
 
-            try:
-                client = MCPClient(name=name, config=config, silent=self.silent)
-                await client.connect()
-                self.clients[name] = client
-            except Exception as e:
-                logger.error(f"Failed to start MCP client '{name}': {e}")
+            pending.append(
+                MCPClient(
+                    name=name,
+                    config=config,
+                    silent=self.silent,
+                    http_transport=self._get_http_transport() if config.type == "streamable_http" else None,
+                )
+            )
+
+        # Servers are independent, so startup takes as long as the slowest one
+        results = await asyncio.gather(
+            *(self._connect_client(client) for client in pending),
+            return_exceptions=True,
+        )
+        for client, result in zip(pending, results):
+            if isinstance(result, Exception):
+                logger.error("Failed to start MCP client '{}': {}", client.name, result)
                 # Continue with other clients
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            self.clients[client.name] = client
+            self._version += 1
+
+    async def _connect_client(self, client: MCPClient) -> None:
+        """Start a client's connection task and wait until it is connected or gives up."""
+        ready = asyncio.get_running_loop().create_future()
+        task = asyncio.create_task(self._run_client(client, ready))
+
+        done, _ = await asyncio.wait({ready}, timeout=self.start_timeout)
+        if not done:
+            # Don't leave a half-started server process behind
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            raise TimeoutError(f"connect timed out after {self.start_timeout}s")
+
+        if ready.exception() is not None:
+            await asyncio.gather(task, return_exceptions=True)
+            raise ready.exception()
+        self._client_tasks[client.name] = task
+
+    async def _run_client(self, client: MCPClient, ready: asyncio.Future) -> None:
+        """
+        Own one client's connection for its whole lifetime.
+
+        The transport and session contexts hold anyio cancel scopes, which
+        must be exited by the task that entered them. So connect, wait for
+        stop() and disconnect all happen here, in one task per client.
+        """
+        try:
+            await client.connect()
+            ready.set_result(None)
+            await self._stop_event.wait()
+        except asyncio.CancelledError:
+            ready.cancel()
+            raise
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            raise
+        finally:
+            await client.disconnect()
 
     async def stop(self) -> None:
         """Disconnect from all MCP servers."""
-        for name, client in list(self.clients.items()):
-            try:
-                await client.disconnect()
-            except Exception as e:
-                logger.error(f"Error stopping MCP client '{name}': {e}")
-
+        # Each client task disconnects its own client once the event is set
+        self._stop_event.set()
+        tasks = list(self._client_tasks.items())
+        results = await asyncio.gather(*(task for _, task in tasks), return_exceptions=True)
+        for (name, _), result in zip(tasks, results):
+            if isinstance(result, Exception):
+                logger.error("Error stopping MCP client '{}': {}", name, result)
+
+        self._client_tasks.clear()
+        self._stop_event = asyncio.Event()
         self.clients.clear()
+        self._tool_cache.clear()
+        self._tool_locks.clear()
+        self._version += 1
+
+        if self._http_transport is not None:
+            await self._http_transport.aclose()
+            self._http_transport = None
+
+    def _get_http_transport(self) -> httpx.AsyncHTTPTransport:
+        """Get (creating if needed) the shared HTTP/2 connection pool."""
+        if self._http_transport is None:
+            self._http_transport = httpx.AsyncHTTPTransport(
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=32),
+            )
+        return self._http_transport
+
+    @property
+    def version(self) -> int:
+        """Counter bumped whenever a client is added or removed."""
+        return self._version
 
     def get_client(self, name: str) -> MCPClient | None:
         """Get a connected MCP client by name."""
         return self.clients.get(name)
 
-    def get_all_clients(self) -> dict[str, MCPClient]:
-        """Get all connected MCP clients."""
-        return self.clients.copy()
+    def get_all_clients(self) -> Mapping[str, MCPClient]:
+        """Get a read-only live view of all connected MCP clients (copy it before mutating)."""
+        return MappingProxyType(self.clients)
+
+    def list_server_names(self) -> list[str]:
+        """Get the names of all connected MCP servers without contacting them."""
+        return list(self.clients)
+
+    async def get_tools(self, name: str) -> list[dict]:
+        """
+        List tools from one connected MCP server, fetching them on first access.
+
+        Args:
+            name: Client name
+
+        Returns:
+            List of tools, empty if the client is not connected
+        """
+        client = self.clients.get(name)
+        if client is None:
+            return []
+
+        tools = self._tool_cache.get(name)
+        if tools is not None:
+            return tools
+
+        async with self._tool_locks.setdefault(name, asyncio.Lock()):
+            if name not in self._tool_cache:
+                tools = await client.list_tools()
+                if tools is None:
+                    # Failed fetches are not cached, the next access retries
+                    return []
+                self._tool_cache[name] = tools
+            return self._tool_cache[name]
 
     async def list_all_tools(self) -> dict[str, list[dict]]:
         """
@@ -332,15 +450,13 @@ class MCPClientManager:
         Returns:
             Dictionary mapping client name to list of tools
         """
-        all_tools = {}
-        for name, client in self.clients.items():
-            tools = await client.list_tools()
-            all_tools[name] = tools
-        return all_tools
+        names = list(self.clients)
+        fetched = await asyncio.gather(*(self.get_tools(name) for name in names))
+        return dict(zip(names, fetched))
 
 
 @asynccontextmanager
-async def mcp_client_lifespan(clients_config: dict[str, dict]):
+async def mcp_client_lifespan(clients_config: dict[str, MCPClientConfig | dict]):
     """
     Context manager for MCP client lifecycle.
 
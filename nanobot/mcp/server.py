@@ -58,7 +58,7 @@ class NanobotMCPServer:
                 # Return as text content
                 return [TextContent(type="text", text=str(result))]
             except Exception as e:
-                logger.error(f"Error calling tool {name}: {e}")
+                logger.error("Error calling tool {}: {}", name, e)
                 return [TextContent(type="text", text=f"Error: {str(e)}")]
 
     async def run_stdio(self) -> None:
@@ -84,7 +84,7 @@ class NanobotMCPServer:
         from starlette.routing import Route
         import uvicorn
 
-        logger.info(f"Starting MCP server with SSE transport on {host}:{port}")
+        logger.info("Starting MCP server with SSE transport on {}:{}", host, port)
 
         # Create SSE transport
         transport = SseServerTransport("/messages")
@@ -1,16 +1,203 @@
 """Adapter for converting MCP tools to nanobot tools."""
 
-import json
+import asyncio
+import sys
+import time
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Any
 
+import anyio
+import httpx
 from loguru import logger
+from mcp.shared import exceptions as mcp_exceptions
 
 from nanobot.agent.tools.base import Tool
+from nanobot.utils.helpers import json_dumps, json_loads
+
+
+# MCP tool definition fields the adapter reads, under their wire (alias) names
+_TOOL_FIELDS = frozenset({"name", "description", "inputSchema", "annotations"})
+# model_dump(include=...) takes attribute names, snake_case in mcp 2.x
+_TOOL_ATTRIBUTES = _TOOL_FIELDS | {"input_schema"}
+
+# Errors call_tool raises for a failed call: JSON-RPC error responses
+# (McpError in mcp 1.x, MCPError later), timeouts and dropped transports.
+# Anything else is a bug and propagates to ToolRegistry.execute.
+_CALL_ERRORS: tuple[type[BaseException], ...] = (
+    getattr(mcp_exceptions, "McpError", None) or mcp_exceptions.MCPError,
+    TimeoutError,
+    ConnectionError,
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    httpx.HTTPError,
+)
+
+# Content item type -> formatter; unknown types fall back to str()
+_CONTENT_HANDLERS: dict[str, Any] = {
+    "text": lambda item: item.get("text", ""),
+    "resource": lambda item: f"Resource: {item.get('uri', '')}",
+}
+
+
+def _render(item: Any) -> str:
+    """Format a single MCP content item as text."""
+    if isinstance(item, dict):
+        item_type = item.get("type")
+        # Fast path: text items are by far the most common
+        if item_type == "text":
+            return item.get("text", "")
+        return _CONTENT_HANDLERS.get(item_type, str)(item)
+    # Plain strings are already text, skip the str() call
+    return item if type(item) is str else str(item)
+
+
+def _get_flag(obj: Any, alias: str, attribute: str) -> bool:
+    """
+    Read a boolean MCP flag from a dict or an SDK model.
+
+    Dicts use the camelCase wire name; models expose it as an attribute in
+    mcp 1.x and under a snake_case attribute name in mcp 2.x.
+    """
+    if isinstance(obj, dict):
+        return bool(obj.get(alias))
+    return bool(getattr(obj, alias, None) or getattr(obj, attribute, None))
+
+
+def _format_dict_result(result: dict[str, Any]) -> str:
+    """Format a dict result, normally {"content": [...], "isError": ...}."""
+    if "content" in result:
+        content = result["content"]
+        if isinstance(content, list):
+            if len(content) == 1:
+                return _render(content[0])
+            # Handle multiple content items
+            return "\n".join(_render(item) for item in content)
+        elif isinstance(content, str):
+            return content
+        else:
+            return str(content)
+    else:
+        # No content field, return whole result
+        return json_dumps(result, indent=True)
+
+
+def _format_list_result(result: list[Any]) -> str:
+    """Format a bare list result, one item per line."""
+    return "\n".join(item if type(item) is str else str(item) for item in result)
+
+
+# Exact result type -> formatter, looked up before any isinstance checks
+_RESULT_HANDLERS: dict[type, Any] = {
+    dict: _format_dict_result,
+    list: _format_list_result,
+    str: str,
+}
+
+
+def _format_result(result: Any) -> str:
+    """Convert an MCP call_tool result into the text returned to the agent."""
+    handler = _RESULT_HANDLERS.get(type(result))
+    if handler is not None:
+        return handler(result)
+
+    # Subclasses and SDK models (CallToolResult) take the slow path
+    if isinstance(result, dict):
+        return _format_dict_result(result)
+    if isinstance(result, list):
+        return _format_list_result(result)
+    if hasattr(result, "model_dump"):
+        return _format_dict_result(result.model_dump(mode="json", by_alias=True, exclude_none=True))
+    return str(result)
+
+
+def _text_shape(result: Any) -> str | None:
+    """
+    Classify a result holding exactly one text content item.
+
+    Returns "dict" for a plain dict result, "model" for an SDK
+    CallToolResult model, or None for any other shape.
+    """
+    if isinstance(result, dict):
+        content = result.get("content")
+        if (
+            isinstance(content, list)
+            and len(content) == 1
+            and isinstance(content[0], dict)
+            and content[0].get("type") == "text"
+            and "text" in content[0]
+        ):
+            return "dict"
+        return None
+
+    content = getattr(result, "content", None)
+    if (
+        isinstance(content, list)
+        and len(content) == 1
+        and getattr(content[0], "type", None) == "text"
+        and isinstance(getattr(content[0], "text", None), str)
+    ):
+        return "model"
+    return None
+
+
+# Results of read-only MCP tools: (client, tool, canonical args) -> (stored at, text)
+_RESULT_CACHE: OrderedDict[tuple[str, str, str], tuple[float, str]] = OrderedDict()
+_RESULT_CACHE_SIZE = 512
+
+
+def clear_result_cache() -> None:
+    """Drop all cached MCP tool results."""
+    _RESULT_CACHE.clear()
+
+
+@lru_cache(maxsize=1024)
+def _schema_validator(schema_json: str) -> Any | None:
+    """
+    Compile a jsonschema validator for a canonical JSON schema, once per schema.
+
+    Returns None when jsonschema is not installed or the schema itself is
+    invalid, in which case the basic Tool.validate_params check is used.
+    """
+    try:
+        from jsonschema.validators import validator_for
+    except ImportError:
+        return None
+
+    schema = json_loads(schema_json)
+    cls = validator_for(schema)
+    try:
+        cls.check_schema(schema)
+    except Exception as e:
+        logger.warning("Invalid MCP tool input schema, using basic validation: {}", e)
+        return None
+    return cls(schema)
 
 
 class MCPToolAdapter(Tool):
     """Adapter that wraps an MCP tool as a nanobot Tool."""
 
+    # Hundreds of adapters may be built at startup, skip the per-instance __dict__
+    __slots__ = (
+        "client_name",
+        "mcp_tool",
+        "client_session",
+        "_call_tool",
+        "_name",
+        "_description",
+        "_input_schema",
+        "_schema_key",
+        "_stub_parameters",
+        "_schema_bytes",
+        "_full_name",
+        "_full_description",
+        "cacheable",
+        "_text_shape",
+    )
+
+    # Seconds a read-only tool's result is reused for identical arguments
+    cache_ttl: float = 30.0
+
     def __init__(self, client_name: str, mcp_tool: Any, client_session: Any):
         """
         Initialize the MCP tool adapter.
@@ -23,34 +210,97 @@ class MCPToolAdapter(Tool):
         self.client_name = client_name
         self.mcp_tool = mcp_tool
         self.client_session = client_session
+        self._call_tool = client_session.call_tool
 
         # Extract tool properties (handle both dict and Pydantic model)
         if isinstance(mcp_tool, dict):
-            self._name = mcp_tool.get("name", "")
-            self._description = mcp_tool.get("description", "")
-            self._input_schema = mcp_tool.get("inputSchema", {})
+            fields = mcp_tool
+        elif hasattr(mcp_tool, "model_dump"):
+            # Pydantic model: one dump of just the fields we need, keyed by alias
+            fields = mcp_tool.model_dump(by_alias=True, include=_TOOL_ATTRIBUTES)
         else:
-            # Pydantic model
-            self._name = getattr(mcp_tool, "name", "")
-            self._description = getattr(mcp_tool, "description", "")
-            self._input_schema = getattr(mcp_tool, "inputSchema", {})
+            fields = {key: getattr(mcp_tool, key) for key in _TOOL_FIELDS if hasattr(mcp_tool, key)}
+
+        self._name = fields.get("name", "")
+        self._description = fields.get("description", "")
+        input_schema = fields.get("inputSchema", {})
+        # Canonical JSON of the schema, the key for the cached validator
+        self._schema_key: str | None = None
+        if isinstance(input_schema, dict):
+            self._schema_key = json_dumps(input_schema, sort_keys=True)
+        self._input_schema = input_schema
+        self._stub_parameters: dict[str, Any] | None = None
+        self._schema_bytes: bytes | None = None
+        # Set once a result came back as a single text item, see _format
+        self._text_shape: str | None = None
+
+        # Tools the server marks read-only may have their results reused
+        annotations = fields.get("annotations") or {}
+        self.cacheable = _get_flag(annotations, "readOnlyHint", "read_only_hint")
+
+        # Name and description are read for every schema dump, build them once;
+        # interned so description comparisons and hashes upstream are cheap
+        self._full_name = f"mcp_{client_name}_{self._name}"
+        self._full_description = sys.intern(
+            f"[MCP:{client_name}] {self._description or f'MCP tool: {self._name}'}"
+        )
 
     @property
     def name(self) -> str:
         """Tool name with client prefix."""
-        return f"mcp_{self.client_name}_{self._name}"
+        return self._full_name
 
     @property
     def description(self) -> str:
         """Tool description."""
-        desc = self._description or f"MCP tool: {self._name}"
-        return f"[MCP:{self.client_name}] {desc}"
+        return self._full_description
 
     @property
     def parameters(self) -> dict:
         """Tool parameters schema."""
         return self._input_schema
 
+    @property
+    def stub_parameters(self) -> dict[str, Any]:
+        """
+        Compact parameters schema for token-sensitive tool listings.
+
+        Keeps only the required properties and allows anything else; the
+        complete schema is available from get_full_schema().
+        """
+        if self._stub_parameters is None:
+            schema = self._input_schema if isinstance(self._input_schema, dict) else {}
+            properties = schema.get("properties", {})
+            required = [name for name in schema.get("required", []) if name in properties]
+            self._stub_parameters = {
+                "type": "object",
+                "properties": {name: properties[name] for name in required},
+                "required": required,
+                "additionalProperties": True,
+            }
+        return self._stub_parameters
+
+    @property
+    def schema_bytes(self) -> bytes:
+        """The OpenAI function schema (to_schema()) pre-encoded as UTF-8 JSON, built once."""
+        if self._schema_bytes is None:
+            self._schema_bytes = json_dumps(self.to_schema()).encode()
+        return self._schema_bytes
+
+    async def get_full_schema(self) -> dict[str, Any]:
+        """Get the complete input schema (the counterpart of stub_parameters)."""
+        return self._input_schema
+
+    def validate_params(self, params: dict[str, Any]) -> list[str]:
+        """Validate parameters with a jsonschema validator compiled lazily per schema."""
+        validator = _schema_validator(self._schema_key) if self._schema_key else None
+        if validator is None:
+            return super().validate_params(params)
+        return [
+            f"{'.'.join(map(str, error.path)) or 'parameter'}: {error.message}"
+            for error in validator.iter_errors(params)
+        ]
+
     async def execute(self, **kwargs) -> str:
         """
         Execute the MCP tool.
@@ -61,46 +311,80 @@ class MCPToolAdapter(Tool):
         Returns:
             Tool result as string
         """
+        key = None
+        if self.cacheable:
+            key = (self.client_name, self._name, json_dumps(kwargs, sort_keys=True))
+            cached = _RESULT_CACHE.get(key)
+            if cached is not None and time.monotonic() - cached[0] < self.cache_ttl:
+                _RESULT_CACHE.move_to_end(key)
+                return cached[1]
+
+        # Formatted by loguru only if a sink accepts DEBUG
+        logger.debug("Executing MCP tool {} with args: {}", self._full_name, kwargs)
+
+        # Call the MCP tool
         try:
-            logger.debug(f"Executing MCP tool {self.name} with args: {kwargs}")
-
-            # Call the MCP tool
-            result = await self.client_session.call_tool(self._name, kwargs)
-
-            # Extract content from result
-            if isinstance(result, dict):
-                if "content" in result:
-                    content = result["content"]
-                    if isinstance(content, list):
-                        # Handle multiple content items
-                        parts = []
-                        for item in content:
-                            if isinstance(item, dict):
-                                if item.get("type") == "text":
-                                    parts.append(item.get("text", ""))
-                                elif item.get("type") == "resource":
-                                    # Handle resource outputs
-                                    uri = item.get("uri", "")
-                                    parts.append(f"Resource: {uri}")
-                                else:
-                                    # Other types, convert to string
-                                    parts.append(str(item))
-                            else:
-                                parts.append(str(item))
-                        return "\n".join(parts)
-                    elif isinstance(content, str):
-                        return content
-                    else:
-                        return str(content)
-                else:
-                    # No content field, return whole result
-                    return json.dumps(result, indent=2)
-            elif isinstance(result, list):
-                # Handle list results
-                return "\n".join(str(item) for item in result)
-            else:
-                return str(result)
-
-        except Exception as e:
-            logger.error(f"Error executing MCP tool {self.name}: {e}")
+            result = await self._call_tool(self._name, kwargs)
+        except _CALL_ERRORS as e:
+            logger.error("Error executing MCP tool {}: {}", self._full_name, e)
             return f"Error: {str(e)}"
+
+        output = self._format(result)
+        if key is not None and not _get_flag(result, "isError", "is_error"):
+            _RESULT_CACHE[key] = (time.monotonic(), output)
+            _RESULT_CACHE.move_to_end(key)
+            while len(_RESULT_CACHE) > _RESULT_CACHE_SIZE:
+                _RESULT_CACHE.popitem(last=False)
+        return output
+
+    def _format(self, result: Any) -> str:
+        """
+        Format a call_tool result, specialised to the shape this tool returns.
+
+        Tools return the same shape every time, so after one single-text
+        result (a dict or an SDK model) the next ones are read by direct
+        indexing or attribute access, skipping the type checks and model
+        dump in _format_result. Any other shape falls back to it.
+        """
+        shape = self._text_shape
+        if shape is not None:
+            try:
+                if shape == "model":
+                    (item,) = result.content
+                    if item.type == "text":
+                        return item.text
+                else:
+                    (item,) = result["content"]
+                    if item["type"] == "text":
+                        return item["text"]
+            except (AttributeError, KeyError, TypeError, ValueError):
+                pass
+            self._text_shape = None
+
+        output = _format_result(result)
+        self._text_shape = _text_shape(result)
+        return output
+
+    @classmethod
+    async def execute_many(
+        cls,
+        calls: list[tuple["MCPToolAdapter", dict[str, Any]]],
+        max_concurrency: int = 8,
+    ) -> list[str]:
+        """
+        Execute independent MCP tool calls concurrently.
+
+        Args:
+            calls: (adapter, arguments) pairs, possibly spanning several servers
+            max_concurrency: Upper bound on calls in flight at once
+
+        Returns:
+            Tool results as strings, in the same order as calls
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(adapter: "MCPToolAdapter", arguments: dict[str, Any]) -> str:
+            async with semaphore:
+                return await adapter.execute(**arguments)
+
+        return await asyncio.gather(*(run(adapter, arguments) for adapter, arguments in calls))
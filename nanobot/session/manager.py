@@ -1,6 +1,8 @@
 """Session management for conversation history."""
 
 import json
+from collections import deque
+from itertools import islice
 from pathlib import Path
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -17,6 +19,8 @@ class Session:
     A conversation session.
     
     Stores messages in JSONL format for easy reading and persistence.
+    The most recent messages are also kept in LLM format in a bounded
+    deque, so building context does not rescan or reformat the full log.
     """
     
     key: str  # channel:chat_id
@@ -24,6 +28,19 @@ class Session:
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
     metadata: dict[str, Any] = field(default_factory=dict)
+    max_history: int = 50
+    _history: deque[dict[str, Any]] = field(init=False, repr=False)
+    
+    def __post_init__(self) -> None:
+        self._history = deque(
+            (self._to_llm_format(m) for m in self.messages[-self.max_history:]),
+            maxlen=self.max_history,
+        )
+    
+    @staticmethod
+    def _to_llm_format(msg: dict[str, Any]) -> dict[str, Any]:
+        """Keep only the fields the LLM needs (role and content)."""
+        return {"role": msg["role"], "content": msg["content"]}
     
     def add_message(self, role: str, content: str, **kwargs: Any) -> None:
         """Add a message to the session."""
@@ -34,27 +51,28 @@ class Session:
             **kwargs
         }
         self.messages.append(msg)
+        self._history.append(self._to_llm_format(msg))
         self.updated_at = datetime.now()
     
-    def get_history(self, max_messages: int = 50) -> list[dict[str, Any]]:
+    def get_history(self, max_messages: int | None = None) -> list[dict[str, Any]]:
         """
         Get message history for LLM context.
         
         Args:
-            max_messages: Maximum messages to return.
+            max_messages: Maximum messages to return (capped at max_history).
         
         Returns:
             List of messages in LLM format.
         """
-        # Get recent messages
-        recent = self.messages[-max_messages:] if len(self.messages) > max_messages else self.messages
-        
-        # Convert to LLM format (just role and content)
-        return [{"role": m["role"], "content": m["content"]} for m in recent]
+        skip = len(self._history) - max_messages if max_messages is not None else 0
+        if skip <= 0:
+            return list(self._history)
+        return list(islice(self._history, skip, None))
     
     def clear(self) -> None:
         """Clear all messages in the session."""
         self.messages = []
+        self._history.clear()
         self.updated_at = datetime.now()
 
 
@@ -65,8 +83,9 @@ class SessionManager:
     Sessions are stored as JSONL files in the sessions directory.
     """
     
-    def __init__(self, workspace: Path):
+    def __init__(self, workspace: Path, max_history: int = 50):
         self.workspace = workspace
+        self.max_history = max_history
         self.sessions_dir = ensure_dir(Path.home() / ".nanobot" / "sessions")
         self._cache: dict[str, Session] = {}
     
@@ -92,7 +111,7 @@ class SessionManager:
         # Try to load from disk
         session = self._load(key)
         if session is None:
-            session = Session(key=key)
+            session = Session(key=key, max_history=self.max_history)
         
         self._cache[key] = session
         return session
@@ -127,7 +146,8 @@ class SessionManager:
                 key=key,
                 messages=messages,
                 created_at=created_at or datetime.now(),
-                metadata=metadata
+                metadata=metadata,
+                max_history=self.max_history,
             )
         except Exception as e:
             logger.warning(f"Failed to load session {key}: {e}")
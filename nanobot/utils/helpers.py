@@ -1,7 +1,14 @@
 """Utility functions for nanobot."""
 
+import json
 from pathlib import Path
 from datetime import datetime
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
 
 
 def ensure_dir(path: Path) -> Path:
@@ -89,3 +96,35 @@ def parse_session_key(key: str) -> tuple[str, str]:
     if len(parts) != 2:
         raise ValueError(f"Invalid session key: {key}")
     return parts[0], parts[1]
+
+
+def json_dumps(obj: Any, sort_keys: bool = False, indent: bool = False) -> str:
+    """
+    Serialize an object to a compact JSON string.
+    
+    Uses orjson when installed and falls back to the stdlib otherwise.
+    
+    Args:
+        obj: JSON-serializable object.
+        sort_keys: Sort object keys for a canonical encoding.
+        indent: Pretty-print with two-space indentation instead.
+    
+    Returns:
+        JSON string.
+    """
+    if orjson is not None:
+        option = (orjson.OPT_SORT_KEYS if sort_keys else 0) | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return orjson.dumps(obj, option=option).decode()
+        except TypeError:
+            pass  # e.g. non-str keys, let the stdlib handle it
+    if indent:
+        return json.dumps(obj, sort_keys=sort_keys, ensure_ascii=False, indent=2)
+    return json.dumps(obj, sort_keys=sort_keys, ensure_ascii=False, separators=(",", ":"))
+
+
+def json_loads(data: str | bytes) -> Any:
+    """Parse a JSON string or bytes, using orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,193 @@
+import asyncio
+from typing import Any
+
+from nanobot.agent.cache import ResponseCache, ToolValueCache
+from nanobot.agent.loop import AgentLoop
+from nanobot.bus.events import InboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.agent.tools.base import Tool
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+
+
+class CountingProvider(LLMProvider):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    async def chat(self, messages: list[dict[str, Any]], tools: Any = None, **kwargs: Any) -> LLMResponse:
+        self.calls += 1
+        return LLMResponse(content=f"reply {self.calls}")
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+class SleepTool(Tool):
+    parallel_safe = True
+
+    def __init__(self) -> None:
+        self.running = 0
+        self.max_running = 0
+
+    @property
+    def name(self) -> str:
+        return "sleep"
+
+    @property
+    def description(self) -> str:
+        return "sleep tool"
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {"type": "object", "properties": {"tag": {"type": "string"}}}
+
+    async def execute(self, **kwargs: Any) -> str:
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        return kwargs["tag"]
+
+
+def test_response_cache_evicts_least_recently_used() -> None:
+    cache = ResponseCache(max_size=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    assert cache.get("a") == "1"
+    cache.put("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert len(cache) == 2
+
+
+def test_response_cache_key_depends_on_tools() -> None:
+    messages = [{"role": "user", "content": "hi"}]
+    assert ResponseCache.make_key("m", "t1", messages) == ResponseCache.make_key("m", "t1", messages)
+    assert ResponseCache.make_key("m", "t1", messages) != ResponseCache.make_key("m", "t2", messages)
+
+
+def test_tool_value_cache_invalidated_by_mutating_call() -> None:
+    cache = ToolValueCache()
+    cache.record("read_file", '{"path":"a"}', "old", cacheable=True)
+    assert cache.get("read_file", '{"path":"a"}') == "old"
+
+    cache.record("write_file", '{"content":"new","path":"a"}', "ok", cacheable=False)
+    assert cache.get("read_file", '{"path":"a"}') is None
+
+    cache.record("read_file", '{"path":"missing"}', "Error: File not found", cacheable=True)
+    assert cache.get("read_file", '{"path":"missing"}') is None
+
+
+def test_response_cache_entries_expire() -> None:
+    cache = ResponseCache(ttl=0)
+    cache.put("a", "1")
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+async def test_agent_loop_reuses_cached_response(tmp_path, monkeypatch) -> None:
+    import datetime
+
+    class Clock(datetime.datetime):
+        current = datetime.datetime(2026, 1, 1, 10, 0)
+
+        @classmethod
+        def now(cls, tz=None):
+            return cls.current
+
+    monkeypatch.setattr(datetime, "datetime", Clock)
+    monkeypatch.setenv("HOME", str(tmp_path))
+    provider = CountingProvider()
+    agent = AgentLoop(bus=MessageBus(), provider=provider, workspace=tmp_path)
+
+    key = "cli:a"
+    first = await agent._process_message(
+        InboundMessage(channel="cli", sender_id="u", chat_id="a", content="hello")
+    )
+    agent.sessions.delete(key)
+    # The Current Time line in the system prompt is not part of the key
+    Clock.current = datetime.datetime(2026, 1, 1, 10, 1)
+    second = await agent._process_message(
+        InboundMessage(channel="cli", sender_id="u", chat_id="a", content="hello")
+    )
+
+    assert first.content == second.content == "reply 1"
+    assert provider.calls == 1
+
+    # Registering a tool changes the key, so the provider is asked again
+    agent.sessions.delete(key)
+    agent.tools.register(SleepTool())
+    third = await agent._process_message(
+        InboundMessage(channel="cli", sender_id="u", chat_id="a", content="hello")
+    )
+
+    assert third.content == "reply 2"
+
+
+async def test_agent_loop_does_not_cache_provider_errors(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+
+    class FailingProvider(CountingProvider):
+        async def chat(self, messages: list[dict[str, Any]], tools: Any = None, **kwargs: Any) -> LLMResponse:
+            self.calls += 1
+            return LLMResponse(content="Error calling LLM: boom", finish_reason="error")
+
+    provider = FailingProvider()
+    agent = AgentLoop(bus=MessageBus(), provider=provider, workspace=tmp_path)
+
+    for chat_id in ("a", "b"):
+        await agent._process_message(
+            InboundMessage(channel="cli", sender_id="u", chat_id=chat_id, content="hello")
+        )
+
+    assert provider.calls == 2
+
+
+async def test_parallel_safe_tool_calls_run_concurrently(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    agent = AgentLoop(bus=MessageBus(), provider=CountingProvider(), workspace=tmp_path)
+    tool = SleepTool()
+    agent.tools.register(tool)
+
+    calls = [ToolCallRequest(id=str(i), name="sleep", arguments={"tag": str(i)}) for i in range(3)]
+    args_json = [f'{{"tag":"{i}"}}' for i in range(3)]
+    results = await agent._execute_tool_calls(calls, args_json, ToolValueCache())
+
+    assert results == ["0", "1", "2"]
+    assert tool.max_running == 3
+
+
+async def test_stop_wakes_idle_run_loop(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    agent = AgentLoop(bus=MessageBus(), provider=CountingProvider(), workspace=tmp_path)
+
+    task = asyncio.create_task(agent.run())
+    await asyncio.sleep(0)
+    agent.stop()
+
+    await asyncio.wait_for(task, timeout=0.5)
+    assert not task.cancelled()
+
+
+async def test_fast_reply_skips_llm(tmp_path, monkeypatch) -> None:
+    from nanobot.config.schema import FastReplyConfig
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    provider = CountingProvider()
+    agent = AgentLoop(
+        bus=MessageBus(),
+        provider=provider,
+        workspace=tmp_path,
+        fast_replies=[FastReplyConfig(pattern="(?i)ping", reply="pong")],
+    )
+
+    fast = await agent._process_message(
+        InboundMessage(channel="cli", sender_id="u", chat_id="a", content=" PING ")
+    )
+    slow = await agent._process_message(
+        InboundMessage(channel="cli", sender_id="u", chat_id="a", content="ping me later")
+    )
+
+    assert fast.content == "pong"
+    assert slow.content == "reply 1"
+    assert provider.calls == 1
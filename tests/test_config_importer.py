@@ -0,0 +1,67 @@
+import json
+import os
+
+from nanobot.config import importer
+
+
+def test_claude_desktop_config_cached_until_file_changes(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "claude_desktop_config.json"
+    path.write_text(json.dumps({"mcpServers": {"fs": {"command": "npx"}}}))
+    monkeypatch.setattr(importer, "get_claude_desktop_config_path", lambda: path)
+    importer.invalidate_cache()
+
+    first = importer.load_claude_desktop_mcp_config()
+    assert first == {"fs": {"command": "npx"}}
+    assert importer.load_claude_desktop_mcp_config() is first
+
+    path.write_text(json.dumps({"mcpServers": {}}))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert importer.load_claude_desktop_mcp_config() == {}
+
+    path.unlink()
+    assert importer.load_claude_desktop_mcp_config() is None
+
+
+def test_mcp_clients_validated_into_typed_configs() -> None:
+    from nanobot.config.schema import Config, MCPClientStdioConfig, MCPClientStreamableHTTPConfig
+
+    imported = importer.import_mcp_config({"fs": {"command": "npx", "args": ["-y", "fs"]}})
+    assert imported["fs"] == MCPClientStdioConfig(enabled=True, command="npx", args=["-y", "fs"])
+
+    config = Config.model_validate({
+        "mcp": {
+            "clients": {
+                "legacy": {"enabled": True, "command": "server"},
+                "remote": {"type": "streamable_http", "url": "http://localhost:8000/mcp"},
+            }
+        }
+    })
+    assert isinstance(config.mcp.clients["legacy"], MCPClientStdioConfig)
+    assert isinstance(config.mcp.clients["remote"], MCPClientStreamableHTTPConfig)
+    assert list(config.mcp.enabled_clients) == ["legacy"]
+
+    dumped = config.model_dump()
+    assert Config.model_validate(dumped).mcp.clients.root == config.mcp.clients.root
+
+
+def test_load_config_skips_invalid_mcp_clients(tmp_path) -> None:
+    from nanobot.config.loader import load_config
+
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({
+        "providers": {"openrouter": {"apiKey": "sk-or-test"}},
+        "mcp": {
+            "clients": {
+                "draft": {"type": "http", "enabled": False},
+                "legacy": {"type": "sse", "url": "http://localhost:8000/sse"},
+                "fs": {"enabled": True, "command": "npx"},
+            }
+        },
+    }))
+
+    config = load_config(path)
+
+    assert config.get_api_key() == "sk-or-test"
+    assert list(config.mcp.clients) == ["draft", "fs"]
+    assert config.mcp.clients["draft"].url is None
@@ -0,0 +1,171 @@
+import asyncio
+import json
+
+from nanobot.bus.queue import MessageBus
+from nanobot.channels.feishu import FeishuChannel
+from nanobot.config.schema import FeishuConfig
+
+
+def _event(sender: str, text: str) -> dict:
+    return {
+        "event": {
+            "sender": {"sender_id": {"open_id": sender}},
+            "message": {"message_id": "m", "content": json.dumps({"text": text})},
+        }
+    }
+
+
+async def test_inbound_events_are_batched_in_order() -> None:
+    bus = MessageBus()
+    channel = FeishuChannel(FeishuConfig(), bus)
+    channel._running = True
+    drain = asyncio.create_task(channel._drain_event_queue())
+
+    for i in range(3):
+        await channel._handle_message_event(_event("ou_1", f"msg {i}"))
+
+    received = [await asyncio.wait_for(bus.consume_inbound(), timeout=1) for _ in range(3)]
+    drain.cancel()
+
+    assert [m.content for m in received] == ["msg 0", "msg 1", "msg 2"]
+    assert all(m.chat_id == "ou_1" for m in received)
+
+
+def test_verify_signature_accepts_valid_hmac() -> None:
+    import hashlib
+    import hmac
+
+    channel = FeishuChannel(FeishuConfig(encrypt_key="secret"), MessageBus())
+    body = b'{"type": "event"}'
+    signature = hmac.new(b"secret", b"123" + b"abc" + body, hashlib.sha256).hexdigest()
+
+    assert channel._verify_signature("123", "abc", body, signature)
+    assert not channel._verify_signature("123", "abd", body, signature)
+    assert not channel._verify_signature("123", "abc", body, "not-hex")
+
+
+def test_webhook_bot_sends_json_body() -> None:
+    import httpx
+
+    from nanobot.channels.feishu_webhook import FeishuWebhookBot
+
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"code": 0, "msg": "success"})
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    bot = FeishuWebhookBot("https://open.feishu.cn/open-apis/bot/v2/hook/x", client=client)
+
+    assert bot.send_text("你好")["code"] == 0
+    assert requests[0].headers["content-type"].startswith("application/json")
+    assert json.loads(requests[0].content) == {"msg_type": "text", "content": {"text": "你好"}}
+
+
+def test_webhook_bot_raises_http_status_error_without_parsing_body() -> None:
+    import httpx
+    import pytest
+
+    from nanobot.channels.feishu_webhook import FeishuWebhookBot
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(502, content=b"<html>Bad Gateway</html>")
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    bot = FeishuWebhookBot("https://open.feishu.cn/open-apis/bot/v2/hook/x", client=client)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        bot.send_card({"elements": []})
+
+
+async def test_async_webhook_bot_raises_on_error_code() -> None:
+    import httpx
+    import pytest
+
+    from nanobot.channels.feishu_webhook import AsyncFeishuWebhookBot
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"code": 19001, "msg": "param invalid"})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    async with AsyncFeishuWebhookBot("https://example.invalid/hook", client=client) as bot:
+        with pytest.raises(Exception, match="发送消息失败"):
+            await bot.send_markdown("title", "**text**")
+
+
+async def test_large_cards_are_streamed_in_chunks() -> None:
+    import httpx
+
+    from nanobot.channels.feishu_webhook import AsyncFeishuWebhookBot, FeishuWebhookBot
+
+    card = {
+        "header": {"title": {"content": "报表", "tag": "plain_text"}},
+        "elements": [{"tag": "div", "text": {"content": f"第 {i} 行", "tag": "lark_md"}} for i in range(100)],
+    }
+    expected = {"msg_type": "interactive", "card": card}
+    bodies = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(json.loads(request.read()))
+        return httpx.Response(200, json={"code": 0})
+
+    async def async_handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(json.loads(await request.aread()))
+        return httpx.Response(200, json={"code": 0})
+
+    FeishuWebhookBot("https://example.invalid/hook", client=httpx.Client(
+        transport=httpx.MockTransport(handler))).send_card(card)
+    async with AsyncFeishuWebhookBot("https://example.invalid/hook", client=httpx.AsyncClient(
+            transport=httpx.MockTransport(async_handler))) as bot:
+        await bot.send_card(card)
+        await bot.send_card({"elements": card["elements"]})
+
+    assert bodies == [expected, expected, {"msg_type": "interactive", "card": {"elements": card["elements"]}}]
+
+
+def test_webhook_templates_match_message_structure() -> None:
+    from nanobot.channels import feishu_webhook as fw
+
+    assert json.loads(fw._post_body('标"题', [{"tag": "text", "text": "a"}])) == {
+        "msg_type": "post",
+        "content": {"post": {"zh_cn": {"title": '标"题', "content": [[{"tag": "text", "text": "a"}]]}}},
+    }
+    assert json.loads(fw._markdown_body("t", "**%s**")) == {
+        "msg_type": "interactive",
+        "card": {
+            "config": {"wide_screen_mode": True},
+            "header": {"title": {"content": "t", "tag": "plain_text"}},
+            "elements": [{"tag": "div", "text": {"content": "**%s**", "tag": "lark_md"}}],
+        },
+    }
+
+
+def test_shared_async_client_is_per_event_loop() -> None:
+    from nanobot.channels import feishu_webhook
+
+    async def get_twice():
+        client = feishu_webhook._get_shared_async_client()
+        assert feishu_webhook._get_shared_async_client() is client
+        await feishu_webhook.aclose_shared_client()
+        return client
+
+    first = asyncio.run(get_twice())
+    second = asyncio.run(get_twice())
+
+    assert first is not second
+    assert first.is_closed and second.is_closed
+
+
+async def test_webhook_channel_closes_its_client_on_stop() -> None:
+    from nanobot.channels.feishu_simple import FeishuWebhookChannel
+
+    channel = FeishuWebhookChannel(FeishuConfig(), MessageBus(), "https://example.invalid/hook")
+    task = asyncio.create_task(channel.start())
+    await asyncio.sleep(0)
+    client = channel._bot._client
+
+    await channel.stop()
+    await task
+
+    assert client is not None and client.is_closed
@@ -0,0 +1,19 @@
+from nanobot.utils.helpers import json_dumps, json_loads
+
+
+def test_json_dumps_round_trip_and_sort_keys() -> None:
+    data = {"b": 1, "a": ["中文", None]}
+    assert json_dumps(data, sort_keys=True) == '{"a":["中文",null],"b":1}'
+    assert json_loads(json_dumps(data)) == data
+    assert json_loads(b'{"x": 1}') == {"x": 1}
+
+
+def test_json_dumps_falls_back_for_non_str_keys() -> None:
+    assert json_dumps({1: "a"}) == '{"1":"a"}'
+
+
+def test_json_dumps_indent_matches_stdlib() -> None:
+    import json
+
+    data = {"name": "工具", "items": [1, {"ok": True}]}
+    assert json_dumps(data, indent=True) == json.dumps(data, indent=2, ensure_ascii=False)
@@ -0,0 +1,302 @@
+from nanobot.mcp.tools.adapter import MCPToolAdapter
+
+
+class FakeSession:
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+
+    async def call_tool(self, name, arguments):
+        self.calls.append((name, arguments))
+        return self.result
+
+
+def test_adapter_name_and_description() -> None:
+    tool = {"name": "read", "description": "Read a file", "inputSchema": {"type": "object"}}
+    adapter = MCPToolAdapter("fs", tool, FakeSession(None))
+
+    assert adapter.name == "mcp_fs_read"
+    assert adapter.description == "[MCP:fs] Read a file"
+    assert adapter.to_schema()["function"]["parameters"] == {"type": "object"}
+
+    bare = MCPToolAdapter("fs", {"name": "stat"}, FakeSession(None))
+    assert bare.description == "[MCP:fs] MCP tool: stat"
+
+
+def test_adapter_accepts_model_tools_and_has_no_instance_dict() -> None:
+    from types import SimpleNamespace
+
+    tool = SimpleNamespace(name="search", description=None, inputSchema={"type": "object"})
+    adapter = MCPToolAdapter("web", tool, FakeSession(None))
+
+    assert adapter.name == "mcp_web_search"
+    assert adapter.description == "[MCP:web] MCP tool: search"
+    assert adapter.parameters == {"type": "object"}
+    assert not hasattr(adapter, "__dict__")
+
+
+def test_schema_keeps_server_property_order() -> None:
+    schema = {
+        "type": "object",
+        "properties": {"path": {"type": "string"}, "limit": {"type": "integer"}, "a_flag": {}},
+        "required": ["path"],
+    }
+    adapter = MCPToolAdapter("fs", {"name": "read", "inputSchema": schema}, FakeSession(None))
+
+    assert list(adapter.parameters["properties"]) == ["path", "limit", "a_flag"]
+    assert list(adapter.to_schema()["function"]["parameters"]["properties"]) == ["path", "limit", "a_flag"]
+
+
+def test_validate_params_uses_compiled_schema() -> None:
+    schema = {
+        "type": "object",
+        "properties": {"path": {"type": "string"}, "limit": {"type": "integer", "minimum": 1}},
+        "required": ["path"],
+    }
+    adapter = MCPToolAdapter("fs", {"name": "read", "inputSchema": schema}, FakeSession(None))
+
+    assert adapter.validate_params({"path": "a.txt", "limit": 5}) == []
+    errors = adapter.validate_params({"limit": 0})
+    assert any("'path' is a required property" in e for e in errors)
+    assert any(e.startswith("limit:") for e in errors)
+
+
+async def test_execute_formats_content_items() -> None:
+    result = {
+        "content": [
+            {"type": "text", "text": "hello"},
+            {"type": "resource", "uri": "file:///a.txt"},
+            {"type": "image", "data": "..."},
+            "raw",
+        ]
+    }
+    session = FakeSession(result)
+    adapter = MCPToolAdapter("fs", {"name": "read"}, session)
+
+    output = await adapter.execute(path="a.txt")
+
+    assert output.split("\n") == [
+        "hello",
+        "Resource: file:///a.txt",
+        str({"type": "image", "data": "..."}),
+        "raw",
+    ]
+    assert session.calls == [("read", {"path": "a.txt"})]
+
+
+async def test_execute_single_text_content() -> None:
+    session = FakeSession({"content": [{"type": "text", "text": "only"}]})
+    adapter = MCPToolAdapter("fs", {"name": "read"}, session)
+
+    assert await adapter.execute() == "only"
+
+
+def test_adapter_reads_pydantic_tool_definitions() -> None:
+    from pydantic import BaseModel
+
+    class ToolModel(BaseModel):
+        name: str
+        description: str | None = None
+        inputSchema: dict
+        annotations: dict | None = None
+
+    tool = ToolModel(name="query", description="Run SQL", inputSchema={"type": "object"})
+    adapter = MCPToolAdapter("db", tool, FakeSession(None))
+
+    assert adapter.name == "mcp_db_query"
+    assert adapter.description == "[MCP:db] Run SQL"
+    assert adapter.parameters == {"type": "object"}
+
+
+def test_adapter_reads_aliased_tool_definitions() -> None:
+    from pydantic import BaseModel, ConfigDict
+    from pydantic.alias_generators import to_camel
+
+    # mcp 2.x models: snake_case attributes, camelCase aliases on the wire
+    class ToolModel(BaseModel):
+        model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+        name: str
+        description: str | None = None
+        input_schema: dict
+
+    tool = ToolModel(name="query", input_schema={"type": "object", "properties": {"sql": {}}})
+    adapter = MCPToolAdapter("db", tool, FakeSession(None))
+
+    assert adapter.parameters == {"type": "object", "properties": {"sql": {}}}
+
+
+async def test_execute_many_runs_calls_concurrently_in_order() -> None:
+    import asyncio
+
+    in_flight = peak = 0
+
+    class SlowSession:
+        async def call_tool(self, name, arguments):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01 * (5 - arguments["n"]))
+            in_flight -= 1
+            return {"content": [{"type": "text", "text": str(arguments["n"])}]}
+
+    adapter = MCPToolAdapter("slow", {"name": "echo"}, SlowSession())
+    calls = [(adapter, {"n": n}) for n in range(5)]
+
+    assert await MCPToolAdapter.execute_many(calls, max_concurrency=3) == ["0", "1", "2", "3", "4"]
+    assert peak == 3
+
+
+async def test_read_only_tool_results_are_cached_until_ttl(monkeypatch) -> None:
+    from nanobot.mcp.tools import adapter as adapter_module
+
+    adapter_module.clear_result_cache()
+    now = [100.0]
+    monkeypatch.setattr(adapter_module.time, "monotonic", lambda: now[0])
+
+    session = FakeSession({"content": [{"type": "text", "text": "rows"}]})
+    tool = {"name": "list", "annotations": {"readOnlyHint": True}}
+    adapter = MCPToolAdapter("db", tool, session)
+    writer = MCPToolAdapter("db", {"name": "insert"}, session)
+
+    assert adapter.cacheable and not writer.cacheable
+    assert await adapter.execute(table="a", limit=1) == "rows"
+    assert await adapter.execute(limit=1, table="a") == "rows"
+    await writer.execute(table="a")
+    await writer.execute(table="a")
+    assert len(session.calls) == 3
+
+    now[0] += adapter.cache_ttl + 1
+    await adapter.execute(table="a", limit=1)
+    assert len(session.calls) == 4
+
+
+async def test_sdk_model_flags_drive_result_caching() -> None:
+    from pydantic import BaseModel, ConfigDict
+    from pydantic.alias_generators import to_camel
+
+    from nanobot.mcp.tools import adapter as adapter_module
+
+    # mcp 2.x models: snake_case attributes, camelCase aliases on the wire
+    class Model(BaseModel):
+        model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    class ToolAnnotations(Model):
+        read_only_hint: bool | None = None
+
+    class ToolModel(Model):
+        name: str
+        input_schema: dict = {"type": "object"}
+        annotations: ToolAnnotations | None = None
+
+    class TextContent(Model):
+        type: str = "text"
+        text: str
+
+    class CallToolResult(Model):
+        content: list[TextContent]
+        is_error: bool = False
+
+    adapter_module.clear_result_cache()
+    tool = ToolModel(name="list", annotations=ToolAnnotations(read_only_hint=True))
+    session = FakeSession(CallToolResult(content=[TextContent(text="boom")], is_error=True))
+    adapter = MCPToolAdapter("db", tool, session)
+
+    assert adapter.cacheable
+    assert await adapter.execute() == "boom"
+    assert await adapter.execute() == "boom"
+    assert len(session.calls) == 2
+
+    session.result = CallToolResult(content=[TextContent(text="rows")])
+    await adapter.execute()
+    await adapter.execute()
+    assert len(session.calls) == 3
+
+
+async def test_stub_parameters_keep_only_required_properties() -> None:
+    schema = {
+        "type": "object",
+        "properties": {
+            "path": {"type": "string", "description": "File to read"},
+            "encoding": {"type": "string", "description": "Text encoding"},
+        },
+        "required": ["path"],
+    }
+    adapter = MCPToolAdapter("fs", {"name": "read", "inputSchema": schema}, FakeSession(None))
+
+    assert adapter.stub_parameters == {
+        "type": "object",
+        "properties": {"path": {"type": "string", "description": "File to read"}},
+        "required": ["path"],
+        "additionalProperties": True,
+    }
+    assert await adapter.get_full_schema() == schema
+
+
+async def test_execute_falls_back_when_result_shape_changes() -> None:
+    session = FakeSession({"content": [{"type": "text", "text": "first"}]})
+    adapter = MCPToolAdapter("fs", {"name": "read"}, session)
+
+    assert await adapter.execute() == "first"
+    assert await adapter.execute() == "first"
+
+    session.result = {"content": [{"type": "text", "text": "a"}, {"type": "text", "text": "b"}]}
+    assert await adapter.execute() == "a\nb"
+    session.result = {"content": [{"type": "resource", "uri": "file:///x"}]}
+    assert await adapter.execute() == "Resource: file:///x"
+    session.result = ["plain"]
+    assert await adapter.execute() == "plain"
+
+
+def test_schema_bytes_encode_function_schema_once() -> None:
+    import json
+
+    adapter = MCPToolAdapter("fs", {"name": "read", "inputSchema": {"type": "object"}}, FakeSession(None))
+
+    assert json.loads(adapter.schema_bytes) == adapter.to_schema()
+    assert adapter.schema_bytes is adapter.schema_bytes
+
+
+async def test_execute_formats_sdk_model_results() -> None:
+    from pydantic import BaseModel
+
+    class TextContent(BaseModel):
+        type: str = "text"
+        text: str
+
+    class CallToolResult(BaseModel):
+        content: list[TextContent]
+        isError: bool = False
+
+    session = FakeSession(CallToolResult(content=[TextContent(text="a"), TextContent(text="b")]))
+    adapter = MCPToolAdapter("fs", {"name": "read"}, session)
+
+    assert await adapter.execute() == "a\nb"
+
+    # A single text item switches on the model fast path, other shapes fall back
+    session.result = CallToolResult(content=[TextContent(text="only")])
+    assert await adapter.execute() == "only"
+    assert adapter._text_shape == "model"
+    session.result = CallToolResult(content=[TextContent(text="next")])
+    assert await adapter.execute() == "next"
+    session.result = {"content": [{"type": "text", "text": "dict"}]}
+    assert await adapter.execute() == "dict"
+    assert adapter._text_shape == "dict"
+
+
+async def test_execute_reports_call_errors_and_propagates_bugs() -> None:
+    import pytest
+
+    class FailingSession:
+        def __init__(self, error: Exception) -> None:
+            self.error = error
+
+        async def call_tool(self, name, arguments):
+            raise self.error
+
+    adapter = MCPToolAdapter("fs", {"name": "read"}, FailingSession(ConnectionError("closed")))
+    assert await adapter.execute() == "Error: closed"
+
+    adapter = MCPToolAdapter("fs", {"name": "read"}, FailingSession(KeyError("bug")))
+    with pytest.raises(KeyError):
+        await adapter.execute()
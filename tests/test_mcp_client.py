@@ -0,0 +1,189 @@
+import asyncio
+import time
+
+import pytest
+
+from nanobot.config.schema import MCPClientStdioConfig
+from nanobot.mcp import client as client_module
+from nanobot.mcp.client import MCPClient, MCPClientManager
+
+
+async def test_manager_starts_clients_concurrently(monkeypatch) -> None:
+    async def fake_connect(self: MCPClient) -> None:
+        await asyncio.sleep(0.2)
+        if self.name == "broken":
+            raise RuntimeError("boom")
+
+    async def fake_disconnect(self: MCPClient) -> None:
+        pass
+
+    monkeypatch.setattr(MCPClient, "connect", fake_connect)
+    monkeypatch.setattr(MCPClient, "disconnect", fake_disconnect)
+    config = {
+        name: {"enabled": True, "command": "server"}
+        for name in ("one", "two", "three", "broken")
+    }
+    manager = MCPClientManager(config)
+
+    started = time.monotonic()
+    await manager.start()
+
+    assert time.monotonic() - started < 0.5
+    assert sorted(manager.clients) == ["one", "three", "two"]
+
+
+async def test_manager_start_timeout_skips_hung_client(monkeypatch) -> None:
+    disconnected = []
+
+    async def fake_connect(self: MCPClient) -> None:
+        if self.name == "hung":
+            await asyncio.sleep(10)
+
+    async def fake_disconnect(self: MCPClient) -> None:
+        disconnected.append(self.name)
+
+    monkeypatch.setattr(MCPClient, "connect", fake_connect)
+    monkeypatch.setattr(MCPClient, "disconnect", fake_disconnect)
+    config = {
+        "ok": MCPClientStdioConfig(enabled=True, command="server"),
+        "hung": MCPClientStdioConfig(enabled=True, command="server"),
+    }
+    manager = MCPClientManager(config, start_timeout=0.1)
+
+    await manager.start()
+
+    assert list(manager.clients) == ["ok"]
+    assert disconnected == ["hung"]
+
+
+async def test_manager_tool_lists_fetched_once() -> None:
+    class FakeClient:
+        def __init__(self, tools: list[dict]) -> None:
+            self.tools = tools
+            self.calls = 0
+
+        async def list_tools(self) -> list[dict]:
+            self.calls += 1
+            return self.tools
+
+    manager = MCPClientManager({})
+    one, two = FakeClient([{"name": "a"}]), FakeClient([{"name": "b"}])
+    manager.clients = {"one": one, "two": two}
+
+    assert manager.list_server_names() == ["one", "two"]
+    assert await manager.get_tools("one") == [{"name": "a"}]
+    assert await manager.list_all_tools() == {"one": [{"name": "a"}], "two": [{"name": "b"}]}
+    assert await manager.get_tools("two") == [{"name": "b"}]
+    assert await manager.get_tools("missing") == []
+    assert (one.calls, two.calls) == (1, 1)
+
+
+async def test_stdio_env_merged_over_parent_environment(monkeypatch) -> None:
+    captured = []
+
+    def fake_stdio_client(params):
+        captured.append(params)
+        raise ConnectionError("stop here")
+
+    monkeypatch.setattr(client_module, "stdio_client", fake_stdio_client)
+    monkeypatch.setenv("NANOBOT_PARENT_VAR", "parent")
+    monkeypatch.setenv("NANOBOT_OVERRIDDEN_VAR", "parent")
+
+    for env in ({"NANOBOT_OVERRIDDEN_VAR": "child"}, {}):
+        client = MCPClient("fs", MCPClientStdioConfig(command="server", env=env))
+        with pytest.raises(ConnectionError):
+            await client.connect()
+
+    with_env, without_env = (params.env for params in captured)
+    assert with_env["NANOBOT_PARENT_VAR"] == "parent"
+    assert with_env["NANOBOT_OVERRIDDEN_VAR"] == "child"
+    assert without_env["NANOBOT_OVERRIDDEN_VAR"] == "parent"
+
+
+async def test_streamable_http_clients_share_one_transport(monkeypatch) -> None:
+    async def fake_connect(self: MCPClient) -> None:
+        pass
+
+    monkeypatch.setattr(MCPClient, "connect", fake_connect)
+    config = {
+        "one": {"enabled": True, "type": "streamable_http", "url": "http://a/mcp"},
+        "two": {"enabled": True, "type": "streamable_http", "url": "http://b/mcp"},
+        "local": {"enabled": True, "command": "server"},
+    }
+    manager = MCPClientManager(config)
+    await manager.start()
+
+    transport = manager.clients["one"]._http_transport
+    assert transport is not None
+    assert manager.clients["two"]._http_transport is transport
+    assert manager.clients["local"]._http_transport is None
+
+    await manager.stop()
+    assert manager._http_transport is None
+
+
+async def test_clients_connect_and_disconnect_in_one_task(monkeypatch) -> None:
+    tasks: dict[str, list[asyncio.Task]] = {}
+
+    async def fake_connect(self: MCPClient) -> None:
+        tasks[self.name] = [asyncio.current_task()]
+
+    async def fake_disconnect(self: MCPClient) -> None:
+        tasks[self.name].append(asyncio.current_task())
+
+    monkeypatch.setattr(MCPClient, "connect", fake_connect)
+    monkeypatch.setattr(MCPClient, "disconnect", fake_disconnect)
+    manager = MCPClientManager({name: {"enabled": True, "command": "server"} for name in ("one", "two")})
+
+    await manager.start()
+    await manager.stop()
+
+    assert sorted(tasks) == ["one", "two"]
+    for entered, exited in tasks.values():
+        assert entered is exited
+
+
+async def test_slow_server_does_not_block_other_tool_lists() -> None:
+    release = asyncio.Event()
+
+    class FakeClient:
+        def __init__(self, slow: bool) -> None:
+            self.slow = slow
+            self.calls = 0
+
+        async def list_tools(self) -> list[dict]:
+            self.calls += 1
+            if self.slow:
+                await release.wait()
+            return [{"name": "t"}]
+
+    manager = MCPClientManager({})
+    slow, fast = FakeClient(slow=True), FakeClient(slow=False)
+    manager.clients = {"slow": slow, "fast": fast}
+
+    pending = [asyncio.create_task(manager.get_tools("slow")) for _ in range(2)]
+    await asyncio.sleep(0)
+    assert await asyncio.wait_for(manager.get_tools("fast"), timeout=1) == [{"name": "t"}]
+
+    release.set()
+    assert await asyncio.gather(*pending) == [[{"name": "t"}], [{"name": "t"}]]
+    assert slow.calls == 1
+
+
+async def test_failed_tool_list_fetch_is_not_cached() -> None:
+    class FlakyClient:
+        def __init__(self) -> None:
+            self.calls = 0
+
+        async def list_tools(self) -> list[dict] | None:
+            self.calls += 1
+            return None if self.calls == 1 else [{"name": "t"}]
+
+    manager = MCPClientManager({})
+    client = FlakyClient()
+    manager.clients = {"flaky": client}
+
+    assert await manager.get_tools("flaky") == []
+    assert await manager.list_all_tools() == {"flaky": [{"name": "t"}]}
+    assert await manager.get_tools("flaky") == [{"name": "t"}]
+    assert client.calls == 2
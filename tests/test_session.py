@@ -0,0 +1,21 @@
+from nanobot.session.manager import Session
+
+
+def test_history_is_bounded_and_llm_formatted() -> None:
+    session = Session(key="cli:test", max_history=3)
+    for i in range(5):
+        session.add_message("user", f"m{i}")
+
+    assert len(session.messages) == 5
+    assert session.get_history() == [
+        {"role": "user", "content": "m2"},
+        {"role": "user", "content": "m3"},
+        {"role": "user", "content": "m4"},
+    ]
+    assert session.get_history(max_messages=1) == [{"role": "user", "content": "m4"}]
+
+
+def test_history_restored_from_loaded_messages() -> None:
+    messages = [{"role": "user", "content": f"m{i}", "timestamp": "t"} for i in range(4)]
+    session = Session(key="cli:test", messages=messages, max_history=2)
+    assert [m["content"] for m in session.get_history()] == ["m2", "m3"]
@@ -86,3 +86,15 @@ async def test_registry_returns_validation_error() -> None:
     reg.register(SampleTool())
     result = await reg.execute("sample", {"query": "hi"})
     assert "Invalid parameters" in result
+
+
+def test_registry_definitions_json_cached_until_mutation() -> None:
+    reg = ToolRegistry()
+    reg.register(SampleTool())
+    first = reg.get_definitions_json()
+    assert reg.get_definitions_json() is first
+    assert reg.get_definitions() is reg.get_definitions()
+
+    reg.unregister("sample")
+    assert reg.get_definitions() == []
+    assert reg.get_definitions_json() == "[]"